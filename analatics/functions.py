@@ -1,6 +1,10 @@
+from bisect import bisect_left
+
 import numpy as np
 import pandas as pd
 
+from analatics.indicators import rsi
+
 def getPivot(data,index,interval=2):
     resp = {
         "message": None,
@@ -45,27 +49,17 @@ def getPivot(data,index,interval=2):
     # print(sliceData)
     return resp
 
-def getPivots(data,interval=2,beginIndex=None,stopIndex=None):
-
-    resp={
-        "message":None,
-        "data":[],
-        "start_idx" : data.at[interval,"time"],
-        "end_idx" : data.at[len(data) - interval - 1,"time"],
-        "interval":interval,
-        "beginIndex": beginIndex,
-        "stopIndex":stopIndex
-
-    }
-    
+def pivotRange(length,interval=2,beginIndex=None,stopIndex=None):
+    """
+    [start, end) candle positions getPivots evaluates for a series length,
+    or None when the series is shorter than one full pivot window.
+    """
     start_idx = interval
-    end_idx = len(data) - interval 
+    end_idx = length - interval 
     minLen = (interval*2)+1
 
-    if (minLen>len(data)):
-        resp["message"]=f"Data only has length of {len(data)} which is min length is {minLen}"
-        return resp
-        
+    if (minLen>length):
+        return None
 
     if beginIndex :
         if beginIndex>start_idx and (( end_idx-beginIndex)>=minLen):
@@ -75,157 +69,407 @@ def getPivots(data,interval=2,beginIndex=None,stopIndex=None):
     if stopIndex and (( stopIndex-start_idx)>=minLen):
         if stopIndex<end_idx:
             end_idx=stopIndex
+    return start_idx, end_idx
 
-    for idx in range(start_idx, end_idx ):
-        result = getPivot(data, idx, interval)
-        resp["data"].append(result)
-    
+def _pivotHeader(data,interval,beginIndex,stopIndex,empty):
+    n = len(data)
+    resp={
+        "message":None,
+        "data":empty,
+        "start_idx" : data.at[interval,"time"] if interval < n else None,
+        "end_idx" : data.at[n - interval - 1,"time"] if n - interval - 1 >= 0 else None,
+        "interval":interval,
+        "beginIndex": beginIndex,
+        "stopIndex":stopIndex
+
+    }
+    if pivotRange(n, interval) is None:
+        resp["message"]=f"Data only has length of {n} which is min length is {(interval*2)+1}"
+    return resp
+
+def getPivots(data,interval=2,beginIndex=None,stopIndex=None):
+    return getPivotsMulti(data,[interval],beginIndex,stopIndex)[interval]
+
+def getPivotsMulti(data,intervals=(2, 3, 5, 10),beginIndex=None,stopIndex=None):
+    """
+    getPivots for several lookbacks at once.
+
+    All lookbacks share one set of rolling max/min tables (see pivotMasksMulti),
+    so adding a lookback costs a few array comparisons rather than a full pass.
+
+    Returns:
+        dict: {interval: getPivots(data, interval, beginIndex, stopIndex)}
+    """
+    time = data["time"].to_numpy()
+    high = data["high"].to_numpy(dtype=float)
+    low = data["low"].to_numpy(dtype=float)
+    masks = pivotMasksMulti(high, low, intervals)
+
+    resp = {}
+    for interval in intervals:
+        result = _pivotHeader(data, interval, beginIndex, stopIndex, [])
+        bounds = pivotRange(len(data), interval, beginIndex, stopIndex)
+        if bounds is not None:
+            isHigh, isLow = masks[interval]
+            idx = np.arange(*bounds)
+            result["data"] = pivotRecords(
+                time[idx],
+                time[idx - interval],
+                time[idx + interval],
+                np.where(isHigh[idx], high[idx], np.nan),
+                np.where(isLow[idx], low[idx], np.nan),
+                interval,
+            )
+        resp[interval] = result
     return resp
 
+def _sparseTable(values, maxWidth, reduce):
+    # levels[k][j] = reduce(values[j:j + 2**k])
+    levels = [values]
+    width = 1
+    while width * 2 <= maxWidth:
+        prev = levels[-1]
+        levels.append(reduce(prev[:-width], prev[width:]))
+        width *= 2
+    return levels
+
+def _windowExtreme(levels, first, count, width, reduce):
+    # reduce over values[j:j + width] for j in first .. first + count - 1
+    k = width.bit_length() - 1
+    table = levels[k]
+    shift = width - (1 << k)
+    return reduce(table[first:first + count], table[first + shift:first + shift + count])
+
+def pivotMasks(high, low, interval=2):
+    """
+    Vectorized swing detection over NumPy arrays.
+
+    A candle is a swing high when its high is strictly greater than every high
+    in the `interval` candles before and after it (swing low: strictly lower low).
+
+    Parameters:
+        high (np.ndarray): High prices.
+        low (np.ndarray): Low prices.
+        interval (int): Number of candles on each side of the pivot.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Boolean swing high and swing low masks,
+        False wherever the full window does not fit.
+    """
+    return pivotMasksMulti(high, low, [interval])[interval]
+
+def pivotMasksMulti(high, low, intervals):
+    """
+    pivotMasks for several lookbacks sharing one rolling max/min structure.
+
+    A sparse table of power-of-two window maxima/minima is built once up to the
+    largest lookback (O(n log maxInterval)); the extreme of any window is then
+    the max/min of two overlapping table entries, so every lookback costs O(n).
+
+    Returns:
+        dict: {interval: (isHigh, isLow)}
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    n = len(high)
+    maxInterval = max(intervals)
+    highs = _sparseTable(high, maxInterval, np.maximum)
+    lows = _sparseTable(low, maxInterval, np.minimum)
+
+    resp = {}
+    for interval in intervals:
+        isHigh = np.zeros(n, dtype=bool)
+        isLow = np.zeros(n, dtype=bool)
+        count = n - 2 * interval
+        if count > 0:
+            centre = slice(interval, n - interval)
+            beforeMax = _windowExtreme(highs, 0, count, interval, np.maximum)
+            afterMax = _windowExtreme(highs, interval + 1, count, interval, np.maximum)
+            beforeMin = _windowExtreme(lows, 0, count, interval, np.minimum)
+            afterMin = _windowExtreme(lows, interval + 1, count, interval, np.minimum)
+            isHigh[centre] = (high[centre] > beforeMax) & (high[centre] > afterMax)
+            isLow[centre] = (low[centre] < beforeMin) & (low[centre] < afterMin)
+        resp[interval] = (isHigh, isLow)
+    return resp
+
+def pivotRecords(index, startIndex, endIndex, swingHigh, swingLow, interval):
+    """Build getPivot style records from column arrays (NaN marks "not a swing")."""
+    hasHigh = ~np.isnan(swingHigh)
+    hasLow = ~np.isnan(swingLow)
+    valid = hasHigh | hasLow
+    swingHigh = np.where(hasHigh, swingHigh, None)
+    swingLow = np.where(hasLow, swingLow, None)
+    return [
+        {
+            "message": None,
+            "index": i,
+            "startIndex": s,
+            "endIndex": e,
+            "interval": interval,
+            "isSwingHigh": h,
+            "isSwingLow": l,
+            "valid": v,
+        }
+        for i, s, e, h, l, v in zip(
+            np.asarray(index).tolist(),
+            np.asarray(startIndex).tolist(),
+            np.asarray(endIndex).tolist(),
+            swingHigh.tolist(),
+            swingLow.tolist(),
+            valid.tolist(),
+        )
+    ]
+
+def findBreaks(close, starts, levels, above=True):
+    """
+    Find, for many (start, level) pairs, the first close beyond the level.
+
+    One right-to-left sweep over the closes keeps a monotonic stack of the
+    closes that can still be "first beyond" something to their left; each
+    query is then a binary search on that stack. Total cost is
+    O((candles + queries) * log candles) instead of one full mask per query.
+
+    Parameters:
+        close (np.ndarray): Close prices.
+        starts (np.ndarray): First candle position each query may break at.
+        levels (np.ndarray): Price level per query.
+        above (bool): True finds the first close > level, False the first close < level.
+
+    Returns:
+        np.ndarray: Candle position of the break per query, -1 where there is none.
+    """
+    close = np.asarray(close, dtype=float)
+    starts = np.asarray(starts, dtype=np.int64)
+    levels = np.asarray(levels, dtype=float)
+    n = len(close)
+    result = np.full(len(starts), -1, dtype=np.int64)
+    if n == 0 or len(starts) == 0:
+        return result
+
+    sign = -1.0 if above else 1.0
+    keys = (sign * close).tolist()
+    queryKeys = (sign * levels).tolist()
+
+    # Queries in descending start order, skipping those that start past the data
+    order = np.argsort(-starts, kind="stable")
+    order = order[starts[order] < n].tolist()
+    startList = starts.tolist()
+    q = 0
+
+    stackPos = []
+    stackKey = []
+    for j in range(n - 1, -1, -1):
+        key = keys[j]
+        while stackKey and stackKey[-1] >= key:
+            stackKey.pop()
+            stackPos.pop()
+        stackPos.append(j)
+        stackKey.append(key)
+
+        while q < len(order) and startList[order[q]] >= j:
+            k = order[q]
+            p = bisect_left(stackKey, queryKeys[k])
+            if p > 0:
+                result[k] = stackPos[p - 1]
+            q += 1
+    return result
+
+def _swingBreakPositions(swings, data, above):
+    times = data["time"].to_numpy()
+    starts = np.searchsorted(times, swings["time"].to_numpy(), side="right")
+    return findBreaks(data["close"].to_numpy(), starts, swings["value"].to_numpy(), above)
+
+def breakRecords(swingTime, level, breakTime):
+    """Build getSwingHighBreak style {"p1", "p2"} records from column arrays."""
+    return [
+        {"p1": {"time": t, "price": v}, "p2": {"time": b, "price": v}}
+        for t, v, b in zip(swingTime.tolist(), level.tolist(), breakTime.tolist())
+    ]
+
 def getSwingHighBreakDf(swings,data):
     resp =swings.copy()
-    resp['breakHigh'] = [None]*len(resp)
-    for idx in range(0, len(swings) ):
-        testHigh=swings.iloc[idx][["time","value"]]
-        res= data[(data["close"] > testHigh["value"]) & (data['time'] > testHigh['time'])]['time']
-        if len(res)>0 :
-            resp.loc[resp['value']==testHigh['value'],'breakHigh']=res.iloc[0]
+    pos = _swingBreakPositions(swings, data, above=True)
+    times = data["time"].to_numpy()
+    resp['breakHigh'] = pd.Series([times[p] if p >= 0 else None for p in pos], index=resp.index, dtype=object)
     return resp
 
 def getSwingHighBreak(swings,data):
-    # resp =swings.copy()
-    # resp['breakHigh'] = [None]*len(resp)
-    resp=list()
-    for idx in range(0, len(swings) ):
-        testHigh=swings.iloc[idx][["value","time"]]
-        res= data[(data["close"] > testHigh["value"]) & (data['time'] > testHigh['time'])]['time']
-        if len(res)>0 :
-            resp.append({"p1":{"time":testHigh["time"].item(),"price":testHigh["value"].item()},"p2":{"time":res.iloc[0].item(),"price":testHigh["value"].item()}})
-    return resp
+    pos = _swingBreakPositions(swings, data, above=True)
+    hit = pos >= 0
+    return breakRecords(
+        swings["time"].to_numpy()[hit],
+        swings["value"].to_numpy()[hit],
+        data["time"].to_numpy()[pos[hit]],
+    )
 
 def getSwingLowBreak(swings,data):
-    # resp =swings.copy()
-    # resp['breakLow'] = [None]*len(resp)
-    resp=list()
-    for idx in range(0, len(swings) ):
-        # print(swings.iloc[idx])
-        testLow=swings.iloc[idx][["value","time"]]
-        res= data[(data["close"] < testLow["value"]) & (data['time'] > testLow['time'])]['time']
-        if len(res)>0 :
-            resp.append({"p1":{"time":testLow["time"].item(),"price":testLow["value"].item() },"p2":{"time":res.iloc[0].item(),"price":testLow["value"].item() }})
-    return resp
+    pos = _swingBreakPositions(swings, data, above=False)
+    hit = pos >= 0
+    return breakRecords(
+        swings["time"].to_numpy()[hit],
+        swings["value"].to_numpy()[hit],
+        data["time"].to_numpy()[pos[hit]],
+    )
 
 def getSwingLowBreakDf(swings,data):
     resp =swings.copy()
-    resp['breakLow'] = [None]*len(resp)
-    for idx in range(0, len(swings) ):
-        testLow=swings.iloc[idx][["value","time"]]
-        res= data[(data["close"] < testLow["value"]) & (data['time'] > testLow['time'])]['time']
-        if len(res)>0 :
-            resp.loc[resp['time']==testLow['time'],'breakLow']=res.iloc[0]
+    pos = _swingBreakPositions(swings, data, above=False)
+    times = data["time"].to_numpy()
+    resp['breakLow'] = pd.Series([times[p] if p >= 0 else None for p in pos], index=resp.index, dtype=object)
     return resp
 
-def getSwingBreaks(data,interval=2,beginIndex=None,stopIndex=None):
+def swingBreaks(time, high, low, close, isHigh, isLow):
+    """
+    Break of structure lines for precomputed swing masks.
 
-    resp={
-        "message":None,
-        "data":{},
-        "start_idx" : data.at[interval,"time"],
-        "end_idx" : data.at[len(data) - interval - 1,"time"],
-        "interval":interval,
-        "beginIndex": beginIndex,
-        "stopIndex":stopIndex
+    Returns:
+        dict: {"breakLow": [...], "breakHigh": [...]} of {"p1", "p2"} records.
+    """
+    return swingBreaksMulti(time, high, low, close, {None: (isHigh, isLow)})[None]
 
-    }
-    swingData= getPivots(data)
+def swingBreaksMulti(time, high, low, close, masks):
+    """
+    swingBreaks for several sets of swing masks (e.g. one per lookback).
 
-    if swingData["message"] != None:
-        resp["message"] = swingData["message"]
-        return resp
-    df = pd.DataFrame(swingData['data'])
+    Every swing from every set goes into a single findBreaks sweep per side.
 
-    dfSwingHigh=df[df['isSwingHigh'].notna()][['index','startIndex','endIndex','isSwingHigh']]
-    dfSwingHigh.rename(columns={'index': 'time', 'isSwingHigh': 'value'}, inplace=True)
+    Parameters:
+        masks (dict): {key: (isHigh, isLow)}
 
-    dfSwingLow=df[df['isSwingLow'].notna()][['index','startIndex','endIndex','isSwingLow']]
-    dfSwingLow.rename(columns={'index': 'time', 'isSwingLow': 'value'}, inplace=True)
+    Returns:
+        dict: {key: {"breakLow": [...], "breakHigh": [...]}}
+    """
+    time = np.asarray(time)
+    resp = {key: {} for key in masks}
+    for side, level, above, column in (("breakHigh", high, True, 0), ("breakLow", low, False, 1)):
+        positions = [np.flatnonzero(mask[column]) for mask in masks.values()]
+        allPos = np.concatenate(positions) if positions else np.array([], dtype=np.int64)
+        allBreaks = findBreaks(close, allPos + 1, level[allPos], above=above)
+        offset = 0
+        for key, pos in zip(masks, positions):
+            found = allBreaks[offset:offset + len(pos)]
+            offset += len(pos)
+            hit = found >= 0
+            resp[key][side] = breakRecords(time[pos[hit]], level[pos[hit]], time[found[hit]])
+    return {key: {"breakLow": r["breakLow"], "breakHigh": r["breakHigh"]} for key, r in resp.items()}
 
-    breakLow=getSwingLowBreak(dfSwingLow,data)
-    breakHigh = getSwingHighBreak(dfSwingHigh,data)
+def getSwingBreaks(data,interval=2,beginIndex=None,stopIndex=None):
+    return getSwingBreaksMulti(data,[interval],beginIndex,stopIndex)[interval]
 
-    resp["data"] = {
-        "breakLow":pd.DataFrame(breakLow).to_dict(orient='records'),
-        "breakHigh":pd.DataFrame(breakHigh).to_dict(orient='records')
-    }
+def getSwingBreaksMulti(data,intervals=(2, 3, 5, 10),beginIndex=None,stopIndex=None):
+    """
+    getSwingBreaks for several lookbacks, sharing the rolling max/min tables
+    and one break sweep per side across all of them.
+
+    Returns:
+        dict: {interval: getSwingBreaks(data, interval, beginIndex, stopIndex)}
+    """
+    high = data["high"].to_numpy(dtype=float)
+    low = data["low"].to_numpy(dtype=float)
+    masks = {}
+    resp = {}
+    for interval, (isHigh, isLow) in pivotMasksMulti(high, low, intervals).items():
+        resp[interval] = _pivotHeader(data, interval, beginIndex, stopIndex, {})
+        bounds = pivotRange(len(data), interval, beginIndex, stopIndex)
+        if bounds is None:
+            continue
+        # Only swings inside the requested index range
+        keep = np.zeros(len(data), dtype=bool)
+        keep[bounds[0]:bounds[1]] = True
+        masks[interval] = (isHigh & keep, isLow & keep)
+
+    breaks = swingBreaksMulti(
+        data["time"].to_numpy(), high, low, data["close"].to_numpy(dtype=float), masks
+    )
+    for interval, result in breaks.items():
+        resp[interval]["data"] = result
     return resp
 
-def getGap(data,index):
-    resp = {
-        "message": None,
-        "index":data.at[index,"time"],
-        'isBuy':False,
-        'isGap':False,
-        "Pre": None,
-        "Post": None,
-        "valid" : False,
-        # "before": [],
-        # "after":[]
+def swingRecords(time, isSwing, level, interval):
+    """/swings style {time, startIndex, endIndex, value} records for a swing mask."""
+    time = np.asarray(time)
+    pos = np.flatnonzero(isSwing)
+    return [
+        {"time": t, "startIndex": s, "endIndex": e, "value": v}
+        for t, s, e, v in zip(
+            time[pos].tolist(),
+            time[pos - interval].tolist(),
+            time[pos + interval].tolist(),
+            np.asarray(level, dtype=float)[pos].tolist(),
+        )
+    ]
+
+def getSwings(data,interval=2):
+    """
+    Swing highs and lows as plotted by the chart.
+
+    Returns:
+        dict: {"swingHigh": [...], "swingLow": [...]} records with time,
+        startIndex, endIndex and value.
+    """
+    return getSwingsMulti(data,[interval])[interval]
+
+def getSwingsMulti(data,intervals=(2, 3, 5, 10)):
+    """
+    Returns:
+        dict: {interval: getSwings(data, interval)}
+    """
+    time = data["time"].to_numpy()
+    high = data["high"].to_numpy(dtype=float)
+    low = data["low"].to_numpy(dtype=float)
+    return {
+        interval: {
+            "swingHigh": swingRecords(time, isHigh, high, interval),
+            "swingLow": swingRecords(time, isLow, low, interval),
+        }
+        for interval, (isHigh, isLow) in pivotMasksMulti(high, low, intervals).items()
     }
-    df=data.copy()
-    current={}
-    before=[]
-    after=[]
 
-    current = df.iloc[index]
-
-    # All Highs before current index
-    before = df.iloc[index - 1 ]
-    # resp["before"] = sliceData.loc[:index - 1 ]
-    # All Highs after current index
-    after = df.iloc[index + 1]
-    # resp["after"] = sliceData.loc[index + 1:]
-    if(current["open"]<current['close']):
-        resp['isBuy']=True
-        # resp['isGap'] = before['high']<after['low'] and not before["open"]> before["close"]
-        resp['isGap'] = before['high']<after['low'] 
-        if resp["isGap"]:
-            resp["Pre"] = before['high']
-            resp["Post"] =after['low']
-    else:
-        # resp['isGap'] = before['low']>after['high']  and not before["open"]< before["close"]
-        resp['isGap'] = before['low']>after['high']  
+def analyze(data,interval=2):
+    """
+    Swings, break of structure and gaps from a single pass over the candles.
 
-        if resp["isGap"]:
-            resp["Pre"] = before['low']
-            resp["Post"] =after['high']
-    
-    if resp["isGap"]:
-        resp["valid"] = True
-    return resp    
+    The OHLC columns are pulled out once and the pivot masks are shared between
+    the swing markers and the BOS search.
 
-def getGapEnd(data,result):
-    resp = {
-        "message": None,
-        "index":result["index"].item(),
-        'isBuy':result['isBuy'],
-        "Pre": result['Pre'].item(),
-        "Post": result['Post'].item(),
-        "end" : None,
-        # "before": [],
-        # "after":[]
-    }
+    Returns:
+        dict: {"swingHigh", "swingLow", "breakHigh", "breakLow", "gap"} in the
+        shapes returned by the /swings, /BOS and /getGap routes.
+    """
+    resp = analyzeMulti(data,[interval])
+    structure = resp["intervals"][interval]
+    structure["gap"] = resp["gap"]
+    return structure
 
+def analyzeMulti(data,intervals=(2, 3, 5, 10)):
+    """
+    analyze for several pivot lookbacks; gaps do not depend on the lookback
+    and are computed once.
 
-    if result["isBuy"] :
-        res= data[(data["close"] < result["Pre"]) & (data['time'] > result["index"])]['time']
-    else:
-        res= data[(data["close"] > result["Pre"]) & (data['time'] > result["index"])]['time']
-    if len(res)>0 :
-        resp['end']=res.iloc[0].item()
-    else:
-        resp['end']=data.iloc[-1]['time'].item()
-    
-    return resp
+    Returns:
+        dict: {"gap": [...], "intervals": {interval: {"swingHigh", "swingLow",
+        "breakHigh", "breakLow"}}}
+    """
+    time = data["time"].to_numpy()
+    open_ = data["open"].to_numpy(dtype=float)
+    high = data["high"].to_numpy(dtype=float)
+    low = data["low"].to_numpy(dtype=float)
+    close = data["close"].to_numpy(dtype=float)
+
+    masks = pivotMasksMulti(high, low, intervals)
+    breaks = swingBreaksMulti(time, high, low, close, masks)
+    structure = {}
+    for interval, (isHigh, isLow) in masks.items():
+        structure[interval] = {
+            "swingHigh": swingRecords(time, isHigh, high, interval),
+            "swingLow": swingRecords(time, isLow, low, interval),
+            "breakHigh": breaks[interval]["breakHigh"],
+            "breakLow": breaks[interval]["breakLow"],
+        }
+    return {
+        "gap": gapRecords(time, *gapArrays(open_, high, low, close)),
+        "intervals": structure,
+    }
 
 def getGaps(data):
 
@@ -234,8 +478,6 @@ def getGaps(data):
         "data":[],
     }
     
-    start_idx = 1
-    end_idx = len(data) - 1 
     minLen = 3
 
     if (minLen>len(data)):
@@ -243,39 +485,84 @@ def getGaps(data):
         return resp
         
 
-    for idx in range(start_idx, end_idx ):
-        result = getGap(data, idx)
-        if result['isGap']:
-            resp["data"].append(getGapEnd(data,result))
-    
+    time = data["time"].to_numpy()
+    pos, isBuy, pre, post, endPos = gapArrays(
+        data["open"].to_numpy(dtype=float),
+        data["high"].to_numpy(dtype=float),
+        data["low"].to_numpy(dtype=float),
+        data["close"].to_numpy(dtype=float),
+    )
+    resp["data"] = gapRecords(time, pos, isBuy, pre, post, endPos)
     return resp
 
-def calculate_rsi(data, periods=14):
+def gapArrays(open_, high, low, close, begin=1):
+    """
+    Vectorized three-bar gap detection and fill resolution.
+
+    Candle i is a gap when the candles either side of it do not overlap: for a
+    bullish candle high[i-1] < low[i+1], for a bearish one low[i-1] > high[i+1].
+    The gap ends at the first later close back through the pre-gap level, found
+    with findBreaks in one sweep for all gaps.
+
+    Parameters:
+        open_, high, low, close (np.ndarray): OHLC prices.
+        begin (int): First candle position to test (must be >= 1).
+
+    Returns:
+        tuple[np.ndarray, ...]: Gap positions, isBuy flags, Pre and Post levels and
+        the fill position (-1 while the gap is still open).
+    """
+    n = len(close)
+    empty = np.array([], dtype=np.int64)
+    if n < 3 or begin > n - 2:
+        return empty, np.array([], dtype=bool), np.array([]), np.array([]), empty
+
+    idx = np.arange(begin, n - 1)
+    isBuy = open_[idx] < close[idx]
+    prev = idx - 1
+    nxt = idx + 1
+    isGap = np.where(isBuy, high[prev] < low[nxt], low[prev] > high[nxt])
+
+    pos = idx[isGap]
+    isBuy = isBuy[isGap]
+    pre = np.where(isBuy, high[pos - 1], low[pos - 1])
+    post = np.where(isBuy, low[pos + 1], high[pos + 1])
+
+    endPos = np.full(len(pos), -1, dtype=np.int64)
+    endPos[isBuy] = findBreaks(close, pos[isBuy] + 1, pre[isBuy], above=False)
+    endPos[~isBuy] = findBreaks(close, pos[~isBuy] + 1, pre[~isBuy], above=True)
+    return pos, isBuy, pre, post, endPos
+
+def gapRecords(time, pos, isBuy, pre, post, endPos):
+    """Build the /getGap gap records (index, isBuy, Pre, Post, end); open gaps extend to the last candle."""
+    time = np.asarray(time)
+    end = time[np.where(endPos >= 0, endPos, len(time) - 1)]
+    return [
+        {
+            "message": None,
+            "index": i,
+            "isBuy": b,
+            "Pre": p,
+            "Post": q,
+            "end": e,
+        }
+        for i, b, p, q, e in zip(
+            time[pos].tolist(), isBuy.tolist(), pre.tolist(), post.tolist(), end.tolist()
+        )
+    ]
+
+def calculate_rsi(data, periods=14, method="sma"):
     """
     Calculate the Relative Strength Index (RSI) for a given OHLC dataset.
     
     Parameters:
-        data (pd.DataFrame): DataFrame with 'Close' prices.
+        data (pd.DataFrame): DataFrame with 'close' (or 'Close') prices.
         periods (int): Lookback period for RSI (default=14).
+        method (str): 'sma' (default, simple rolling mean), 'wilder' or 'ema'.
     
     Returns:
         pd.Series: RSI values.
     """
-    # Calculate price changes
-    delta = data['Close'].diff()
-    
-    # Separate gains and losses
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    
-    # Calculate average gains and losses (SMA)
-    avg_gain = gain.rolling(window=periods).mean()
-    avg_loss = loss.rolling(window=periods).mean()
-    
-    # Calculate Relative Strength (RS)
-    rs = avg_gain / avg_loss
-    
-    # Calculate RSI
-    rsi = 100 - (100 / (1 + rs))
-    
-    return rsi
\ No newline at end of file
+    column = 'close' if 'close' in data.columns else 'Close'
+    values = rsi(data[column].to_numpy(dtype=float), periods, method)[periods]
+    return pd.Series(values, index=data.index, name='rsi')
@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+def _smooth(values, period, method, seedFrom=0):
+    """
+    Moving average of `values` over `period` using one of:
+        'wilder' - Wilder's RMA (alpha = 1/period), seeded with an SMA
+        'ema'    - exponential average (alpha = 2/(period+1)), seeded with an SMA
+        'sma'    - simple rolling mean
+    `seedFrom` is the first meaningful position (e.g. 1 for price changes).
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if method == "sma":
+        if n >= seedFrom + period:
+            cumsum = np.cumsum(np.insert(values[seedFrom:], 0, 0.0))
+            out[seedFrom + period - 1:] = (cumsum[period:] - cumsum[:-period]) / period
+        return out
+    if method not in ("wilder", "ema"):
+        raise ValueError(f"Unknown smoothing method '{method}'")
+    first = seedFrom + period - 1
+    if n <= first:
+        return out
+    alpha = 1.0 / period if method == "wilder" else 2.0 / (period + 1)
+    tail = values[first:].copy()
+    tail[0] = values[seedFrom:first + 1].mean()
+    # pandas' ewm runs the recursion in compiled code
+    out[first:] = pd.Series(tail).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+def _periods(periods):
+    return [periods] if np.isscalar(periods) else list(periods)
+
+def ema(close, periods=(20,)):
+    """
+    Exponential moving averages for several periods.
+
+    Returns:
+        dict: {period: np.ndarray}
+    """
+    close = np.asarray(close, dtype=float)
+    return {p: _smooth(close, p, "ema") for p in _periods(periods)}
+
+def rsi(close, periods=(14,), method="wilder"):
+    """
+    Relative Strength Index for several periods sharing one gain/loss pass.
+
+    Parameters:
+        close (np.ndarray): Close prices.
+        periods (int | list[int]): Lookback periods.
+        method (str): 'wilder' (default), 'ema' or 'sma' smoothing of gains/losses.
+
+    Returns:
+        dict: {period: np.ndarray} with NaN until the period has filled.
+    """
+    close = np.asarray(close, dtype=float)
+    delta = np.diff(close, prepend=np.nan)
+    delta[0] = 0.0
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    # SMA keeps calculate_rsi's original convention of counting the first bar
+    seedFrom = 0 if method == "sma" else 1
+
+    resp = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p in _periods(periods):
+            avgGain = _smooth(gain, p, method, seedFrom)
+            avgLoss = _smooth(loss, p, method, seedFrom)
+            resp[p] = 100 - (100 / (1 + avgGain / avgLoss))
+    return resp
+
+def atr(high, low, close, periods=(14,), method="wilder"):
+    """
+    Average True Range for several periods sharing one true range array.
+
+    Returns:
+        dict: {period: np.ndarray}
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    prevClose = np.concatenate(([close[0]], close[:-1])) if len(close) else close
+    trueRange = np.maximum(high, prevClose) - np.minimum(low, prevClose)
+    return {p: _smooth(trueRange, p, method) for p in _periods(periods)}
+
+def bollinger(close, periods=(20,), k=2.0):
+    """
+    Bollinger bands (population std) for several periods.
+
+    Rolling sums come from one shared pair of prefix sums, so each extra period
+    is O(n) array arithmetic.
+
+    Returns:
+        dict: {period: {"middle", "upper", "lower"}}
+    """
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    # Centre before summing squares to keep the variance well conditioned
+    offset = close.mean() if n else 0.0
+    centred = close - offset
+    s1 = np.concatenate(([0.0], np.cumsum(centred)))
+    s2 = np.concatenate(([0.0], np.cumsum(centred * centred)))
+
+    resp = {}
+    for p in _periods(periods):
+        middle = np.full(n, np.nan)
+        upper = np.full(n, np.nan)
+        lower = np.full(n, np.nan)
+        if n >= p:
+            mean = (s1[p:] - s1[:-p]) / p
+            var = np.maximum((s2[p:] - s2[:-p]) / p - mean * mean, 0.0)
+            std = np.sqrt(var)
+            middle[p - 1:] = mean + offset
+            upper[p - 1:] = middle[p - 1:] + k * std
+            lower[p - 1:] = middle[p - 1:] - k * std
+        resp[p] = {"middle": middle, "upper": upper, "lower": lower}
+    return resp
+
+def macd(close, settings=((12, 26, 9),)):
+    """
+    MACD line, signal and histogram for several (fast, slow, signal) settings.
+    EMAs shared between settings are computed once.
+
+    Returns:
+        dict: {(fast, slow, signal): {"macd", "signal", "histogram"}}
+    """
+    close = np.asarray(close, dtype=float)
+    settings = [tuple(s) for s in settings]
+    emas = ema(close, sorted({p for fast, slow, _ in settings for p in (fast, slow)}))
+
+    resp = {}
+    for fast, slow, signal in settings:
+        line = emas[fast] - emas[slow]
+        valid = np.flatnonzero(~np.isnan(line))
+        signalLine = np.full(len(close), np.nan)
+        if len(valid):
+            signalLine[valid[0]:] = _smooth(line[valid[0]:], signal, "ema")
+        resp[(fast, slow, signal)] = {
+            "macd": line,
+            "signal": signalLine,
+            "histogram": line - signalLine,
+        }
+    return resp
+
+def getIndicators(data, spec):
+    """
+    Compute a batch of indicators over one candle DataFrame.
+
+    The OHLC columns are extracted once and shared by every indicator/period.
+
+    Parameters:
+        data (pd.DataFrame): Candles with lowercase high/low/close columns.
+        spec (dict): e.g. {"rsi": [14, 21], "rsiMethod": "wilder", "ema": [20, 50],
+            "atr": [14], "bollinger": [20], "macd": [[12, 26, 9]]}
+
+    Returns:
+        dict: Results keyed by indicator then by period (as a string, or
+        "fast,slow,signal" for MACD).
+    """
+    close = data["close"].to_numpy(dtype=float)
+    resp = {}
+    if spec.get("rsi"):
+        resp["rsi"] = rsi(close, spec["rsi"], spec.get("rsiMethod", "wilder"))
+    if spec.get("ema"):
+        resp["ema"] = ema(close, spec["ema"])
+    if spec.get("atr"):
+        resp["atr"] = atr(
+            data["high"].to_numpy(dtype=float), data["low"].to_numpy(dtype=float), close, spec["atr"]
+        )
+    if spec.get("bollinger"):
+        resp["bollinger"] = bollinger(close, spec["bollinger"], spec.get("bollingerK", 2.0))
+    if spec.get("macd"):
+        resp["macd"] = macd(close, spec["macd"])
+    return {
+        name: {",".join(map(str, key)) if isinstance(key, tuple) else str(key): value
+               for key, value in results.items()}
+        for name, results in resp.items()
+    }
@@ -0,0 +1,232 @@
+import numpy as np
+
+from analatics.functions import (
+    findBreaks,
+    gapArrays,
+    breakRecords,
+    gapRecords,
+    pivotMasks,
+    pivotRecords,
+)
+
+COLUMNS = ("time", "open", "high", "low", "close")
+
+class SeriesAnalytics:
+    """
+    Pivot, break of structure and gap state for one candle series.
+
+    Candles are appended with `append`; only the tail that the pivot `interval`
+    can still affect is re-evaluated, and only open swings/gaps are tested
+    against the new closes, so an update costs O(new candles) rather than
+    O(history). The accessors return the same structures as getPivots,
+    getSwingBreaks and getGaps would for the whole series.
+    """
+
+    def __init__(self, data=None, interval=2):
+        self.interval = interval
+        self._n = 0
+        self._columns = {}
+        self._isHigh = np.zeros(0, dtype=bool)
+        self._isLow = np.zeros(0, dtype=bool)
+        # Swing positions, the position of their break (-1 while unbroken) and
+        # the keys of the swings that are still unbroken
+        self._swings = {"high": ([], [], []), "low": ([], [], [])}
+        # Gap position, isBuy, Pre, Post, fill position (-1 while open)
+        self._gaps = ([], [], [], [], [])
+        self._openGaps = []
+        if data is not None and len(data):
+            self.append(data)
+
+    def __len__(self):
+        return self._n
+
+    def column(self, name):
+        """View of one column for the candles appended so far."""
+        return self._columns[name][:self._n]
+
+    def append(self, data):
+        """
+        Append candles (DataFrame with time/open/high/low/close, oldest first).
+
+        Returns:
+            dict: What changed - newly final "pivots" records, "breakHigh" and
+            "breakLow" lines that resolved in this update and "gaps" that are
+            new or whose end moved.
+        """
+        m = len(data)
+        if m == 0:
+            return {"pivots": [], "breakHigh": [], "breakLow": [], "gaps": []}
+        if self._n and not data["time"].iloc[0] > self.column("time")[-1]:
+            raise ValueError("Appended candles must start after the last stored candle")
+
+        old = self._n
+        self._reserve(old + m, data)
+        for name in COLUMNS:
+            self._columns[name][old:old + m] = data[name].to_numpy()
+        self._n = old + m
+
+        newPivots = self._updatePivots(old)
+        breakHigh = self._updateBreaks("high", old, newPivots)
+        breakLow = self._updateBreaks("low", old, newPivots)
+        gaps = self._updateGaps(old)
+        return {
+            "pivots": self._pivotRecords(newPivots),
+            "breakHigh": breakHigh,
+            "breakLow": breakLow,
+            "gaps": gaps,
+        }
+
+    def pivots(self):
+        """Records as in getPivots(data, interval)["data"]."""
+        return self._pivotRecords(np.arange(self.interval, max(self.interval, self._n - self.interval)))
+
+    def swingBreaks(self):
+        """{"breakLow", "breakHigh"} as in getSwingBreaks(data)["data"]."""
+        return {
+            "breakLow": self.breakRecords("low", None),
+            "breakHigh": self.breakRecords("high", None),
+        }
+
+    def gaps(self):
+        """Records as in getGaps(data)["data"]."""
+        return self._gapRecords(None)
+
+    def _reserve(self, size, data):
+        capacity = len(self._isHigh)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, 1024)
+        for name in COLUMNS:
+            column = self._columns.get(name)
+            if column is not None:
+                dtype = column.dtype
+            elif name == "time":
+                dtype = data["time"].to_numpy().dtype
+            else:
+                dtype = float
+            grown = np.empty(capacity, dtype=dtype)
+            if column is not None:
+                grown[:self._n] = column[:self._n]
+            self._columns[name] = grown
+        for attr in ("_isHigh", "_isLow"):
+            grown = np.zeros(capacity, dtype=bool)
+            grown[:self._n] = getattr(self, attr)[:self._n]
+            setattr(self, attr, grown)
+
+    def _updatePivots(self, old):
+        interval = self.interval
+        n = self._n
+        # Centres that became final: their after-window now fits
+        lo = max(interval, old - interval)
+        hi = n - interval
+        if hi <= lo:
+            return np.array([], dtype=np.int64)
+        start = lo - interval
+        isHigh, isLow = pivotMasks(
+            self.column("high")[start:n], self.column("low")[start:n], interval
+        )
+        self._isHigh[lo:hi] = isHigh[lo - start:hi - start]
+        self._isLow[lo:hi] = isLow[lo - start:hi - start]
+        return np.arange(lo, hi)
+
+    def _updateBreaks(self, side, old, newPivots):
+        positions, breaks, pending = self._swings[side]
+        mask = self._isHigh if side == "high" else self._isLow
+        levels = self.column(side)
+        added = newPivots[mask[newPivots]].tolist()
+        first = len(positions)
+        positions.extend(added)
+        breaks.extend([-1] * len(added))
+        pending.extend(range(first, len(positions)))
+        if not pending:
+            return []
+        # Open swings already scanned everything before `old`
+        segment = min([old] + [positions[k] + 1 for k in range(first, len(positions))])
+        starts = np.array([max(positions[k] + 1, segment) for k in pending]) - segment
+        found = findBreaks(
+            self.column("close")[segment:],
+            starts,
+            levels[[positions[k] for k in pending]],
+            above=(side == "high"),
+        )
+        resolved = []
+        for k, p in zip(pending, found.tolist()):
+            if p >= 0:
+                breaks[k] = p + segment
+                resolved.append(k)
+        pending[:] = [k for k in pending if breaks[k] < 0]
+        return self.breakRecords(side, resolved)
+
+    def _updateGaps(self, old):
+        n = self._n
+        lo = max(1, old - 1)
+        if n - lo < 2:
+            return []
+        position, isBuy, pre, post, end = self._gaps
+        first = len(position)
+        start = lo - 1
+        pos, buy, preLevel, postLevel, endPos = gapArrays(
+            self.column("open")[start:],
+            self.column("high")[start:],
+            self.column("low")[start:],
+            self.column("close")[start:],
+        )
+        position.extend((pos + start).tolist())
+        isBuy.extend(buy.tolist())
+        pre.extend(preLevel.tolist())
+        post.extend(postLevel.tolist())
+        end.extend(np.where(endPos >= 0, endPos + start, -1).tolist())
+
+        changed = list(range(first, len(position)))
+        for above in (False, True):
+            pending = [k for k in self._openGaps if isBuy[k] != above]
+            if not pending:
+                continue
+            found = findBreaks(
+                self.column("close")[old:],
+                np.zeros(len(pending), dtype=np.int64),
+                np.array([pre[k] for k in pending]),
+                above=above,
+            )
+            for k, p in zip(pending, found.tolist()):
+                if p >= 0:
+                    end[k] = p + old
+            # Still-open gaps extend to the new last candle, so they change too
+            changed.extend(pending)
+        self._openGaps = [k for k in self._openGaps + list(range(first, len(position))) if end[k] < 0]
+        return self._gapRecords(sorted(changed))
+
+    def _pivotRecords(self, idx):
+        idx = np.asarray(idx, dtype=np.int64)
+        time = self.column("time")
+        return pivotRecords(
+            time[idx],
+            time[idx - self.interval],
+            time[idx + self.interval],
+            np.where(self._isHigh[idx], self.column("high")[idx], np.nan),
+            np.where(self._isLow[idx], self.column("low")[idx], np.nan),
+            self.interval,
+        )
+
+    def breakRecords(self, side, keys):
+        positions, breaks, _ = self._swings[side]
+        if keys is None:
+            keys = [k for k in range(len(positions)) if breaks[k] >= 0]
+        pos = np.array([positions[k] for k in keys], dtype=np.int64)
+        hit = np.array([breaks[k] for k in keys], dtype=np.int64)
+        time = self.column("time")
+        return breakRecords(time[pos], self.column(side)[pos], time[hit])
+
+    def _gapRecords(self, keys):
+        position, isBuy, pre, post, end = self._gaps
+        if keys is None:
+            keys = range(len(position))
+        pick = lambda values, dtype: np.array([values[k] for k in keys], dtype=dtype)
+        return gapRecords(
+            self.column("time"),
+            pick(position, np.int64),
+            pick(isBuy, bool),
+            pick(pre, float),
+            pick(post, float),
+            pick(end, np.int64),
+        )
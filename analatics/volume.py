@@ -0,0 +1,107 @@
+import numpy as np
+
+class VolumeIndex:
+    """
+    Prefix-sum index over a candle series for windowed volume queries.
+
+    Cumulative volume, price*volume and signed (buy - sell) volume are built
+    once, so VWAP and volume delta over any [lo, hi) window are O(1). For the
+    volume profile every candle is assigned to a fixed price bucket (by its
+    typical price) and each bucket keeps its candle positions with running
+    volume sums; a window is then two binary searches per bucket, i.e.
+    O(buckets * log n) with O(n) memory.
+    """
+
+    def __init__(self, data, buckets=50):
+        self.time = data["time"].to_numpy()
+        high = data["high"].to_numpy(dtype=float)
+        low = data["low"].to_numpy(dtype=float)
+        close = data["close"].to_numpy(dtype=float)
+        open_ = data["open"].to_numpy(dtype=float)
+        volume = data["volume"].to_numpy(dtype=float)
+        typical = (high + low + close) / 3
+        # Candle direction as the buy/sell split (no tick data available)
+        signed = np.sign(close - open_) * volume
+
+        self._volume = np.concatenate(([0.0], np.cumsum(volume)))
+        self._priceVolume = np.concatenate(([0.0], np.cumsum(typical * volume)))
+        self._delta = np.concatenate(([0.0], np.cumsum(signed)))
+
+        n = len(typical)
+        lo = low.min() if n else 0.0
+        hi = high.max() if n else 0.0
+        self.edges = np.linspace(lo, hi if hi > lo else lo + 1.0, buckets + 1)
+        bucket = np.clip(np.searchsorted(self.edges, typical, side="right") - 1, 0, buckets - 1)
+
+        # Candle positions grouped by bucket with per-bucket running sums
+        order = np.argsort(bucket, kind="stable")
+        bounds = np.searchsorted(bucket[order], np.arange(buckets + 1))
+        buyVolume = np.where(signed > 0, volume, 0.0)
+        sellVolume = np.where(signed < 0, volume, 0.0)
+        self._buckets = []
+        for b in range(buckets):
+            pos = order[bounds[b]:bounds[b + 1]]
+            self._buckets.append((
+                pos,
+                np.concatenate(([0.0], np.cumsum(volume[pos]))),
+                np.concatenate(([0.0], np.cumsum(buyVolume[pos]))),
+                np.concatenate(([0.0], np.cumsum(sellVolume[pos]))),
+            ))
+
+    def __len__(self):
+        return len(self.time)
+
+    def positions(self, start=None, end=None):
+        """[lo, hi) candle positions for start <= time <= end."""
+        lo = 0 if start is None else int(np.searchsorted(self.time, start, side="left"))
+        hi = len(self.time) if end is None else int(np.searchsorted(self.time, end, side="right"))
+        return lo, max(lo, hi)
+
+    def volume(self, lo, hi):
+        return self._volume[hi] - self._volume[lo]
+
+    def vwap(self, lo, hi):
+        """Volume weighted average (typical) price over the window, None if no volume."""
+        volume = self.volume(lo, hi)
+        if volume <= 0:
+            return None
+        return (self._priceVolume[hi] - self._priceVolume[lo]) / volume
+
+    def vwapLine(self, lo, hi):
+        """VWAP anchored at the window start, one value per candle."""
+        volume = self._volume[lo + 1:hi + 1] - self._volume[lo]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (self._priceVolume[lo + 1:hi + 1] - self._priceVolume[lo]) / volume
+
+    def delta(self, lo, hi):
+        """Net buy - sell volume over the window."""
+        return self._delta[hi] - self._delta[lo]
+
+    def cvd(self, lo, hi):
+        """Cumulative volume delta from the window start, one value per candle."""
+        return self._delta[lo + 1:hi + 1] - self._delta[lo]
+
+    def profile(self, lo, hi):
+        """
+        Volume by price bucket over the window.
+
+        Returns:
+            dict: bucket "low"/"high" edges with total, "buy" (up candle) and
+            "sell" (down candle) volume.
+        """
+        total = np.empty(len(self._buckets))
+        buy = np.empty(len(self._buckets))
+        sell = np.empty(len(self._buckets))
+        for b, (pos, volume, buyVolume, sellVolume) in enumerate(self._buckets):
+            i = np.searchsorted(pos, lo, side="left")
+            j = np.searchsorted(pos, hi, side="left")
+            total[b] = volume[j] - volume[i]
+            buy[b] = buyVolume[j] - buyVolume[i]
+            sell[b] = sellVolume[j] - sellVolume[i]
+        return {
+            "low": self.edges[:-1],
+            "high": self.edges[1:],
+            "volume": total,
+            "buy": buy,
+            "sell": sell,
+        }
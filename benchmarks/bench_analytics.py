@@ -0,0 +1,177 @@
+"""
+Analytics benchmark suite.
+
+Runs every analytics function and JSON route over synthetic OHLC series of
+several sizes and writes one JSON line per (target, size) with wall time,
+peak traced memory and a checksum of the result, so runs can be diffed:
+
+    python -m benchmarks.bench_analytics --output before.jsonl
+    python -m benchmarks.bench_analytics --output after.jsonl --compare before.jsonl
+"""
+import argparse
+import gc
+import hashlib
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from analatics.functions import analyze, getGaps, getPivots, getSwingBreaks, getSwings
+from analatics.indicators import getIndicators
+from analatics.volume import VolumeIndex
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+INDICATORS = {"rsi": [14], "ema": [20, 50], "atr": [14], "bollinger": [20], "macd": [[12, 26, 9]]}
+
+def syntheticCandles(n, seed=0, start=1_700_000_000, step=900):
+    """Deterministic random-walk OHLCV candles with epoch-second times."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = np.concatenate(([close[0]], close[:-1])) if n else close
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 0.5, n))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 0.5, n))
+    return pd.DataFrame({
+        "time": start + step * np.arange(n, dtype=np.int64),
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": rng.random(n) * 10,
+    })
+
+def checksum(result):
+    """Stable digest of a result, whatever containers/scalars it is made of."""
+    if isinstance(result, (bytes, bytearray)):
+        payload = bytes(result)
+    else:
+        payload = json.dumps(result, sort_keys=True, default=_plain).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+def _plain(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def measure(fn, repeat):
+    """Best wall time over `repeat` runs, then one traced run for peak memory."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+def functionTargets(data):
+    volume = VolumeIndex(data)
+    return {
+        "getPivots": lambda: getPivots(data),
+        "getSwings": lambda: getSwings(data),
+        "getSwingBreaks": lambda: getSwingBreaks(data),
+        "getGaps": lambda: getGaps(data),
+        "analyze": lambda: analyze(data),
+        "getIndicators": lambda: getIndicators(data, INDICATORS),
+        "VolumeIndex": lambda: VolumeIndex(data).vwap(0, len(data)),
+        "VolumeIndex.profile": lambda: volume.profile(0, len(data)),
+    }
+
+def routeTargets(data, payload):
+    from main import app, candle_cache
+
+    app.config["LOGIN_DISABLED"] = True
+    client = app.test_client()
+    if payload == "handle":
+        body = {"handle": candle_cache.put("BENCH", "15m", len(data), "", data)}
+    else:
+        body = {"data": data.to_dict(orient="records")}
+
+    def post(url, extra=None):
+        def call():
+            response = client.post(url, json={**body, **(extra or {})})
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} returned {response.status_code}")
+            return response.data
+        return call
+
+    return {
+        "route:/swings": post("/swings"),
+        "route:/BOS": post("/BOS"),
+        "route:/getGap": post("/getGap"),
+        "route:/analyze": post("/analyze"),
+        "route:/indicators": post("/indicators", {"indicators": INDICATORS}),
+        "route:/volume": post("/volume"),
+    }
+
+def run(sizes, repeat, routes, payload, only, seed):
+    for size in sizes:
+        data = syntheticCandles(size, seed)
+        targets = functionTargets(data)
+        if routes:
+            targets.update(routeTargets(data, payload))
+        for name, fn in targets.items():
+            if only and not any(o in name for o in only):
+                continue
+            seconds, peak, result = measure(fn, repeat)
+            yield {
+                "target": name,
+                "size": size,
+                "seconds": round(seconds, 6),
+                "peak_bytes": peak,
+                "checksum": checksum(result),
+                "payload": payload if name.startswith("route:") else None,
+            }
+
+def compare(rows, baselinePath):
+    with open(baselinePath) as f:
+        baseline = {(r["target"], r["size"]): r for r in (json.loads(line) for line in f if line.strip())}
+    print(f"{'target':28} {'size':>9} {'seconds':>10} {'ratio':>7} {'memory':>7}  checksum", file=sys.stderr)
+    for row in rows:
+        old = baseline.get((row["target"], row["size"]))
+        if old is None:
+            continue
+        ratio = row["seconds"] / old["seconds"] if old["seconds"] else float("nan")
+        memory = row["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else float("nan")
+        same = "same" if row["checksum"] == old["checksum"] else "CHANGED"
+        print(f"{row['target']:28} {row['size']:>9} {row['seconds']:>10.4f} {ratio:>6.2f}x {memory:>6.2f}x  {same}",
+              file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",")], default=DEFAULT_SIZES,
+                        help="comma separated candle counts (default 1000,10000,100000,1000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per target, best is kept")
+    parser.add_argument("--no-routes", action="store_true", help="skip the Flask test-client routes")
+    parser.add_argument("--payload", choices=["handle", "data"], default="handle",
+                        help="send routes a candle cache handle or the full data array")
+    parser.add_argument("--only", action="append", help="substring filter on target names (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON lines here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON lines file to compare against")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    rows = []
+    try:
+        for row in run(args.sizes, args.repeat, not args.no_routes, args.payload, args.only, args.seed):
+            rows.append(row)
+            out.write(json.dumps(row) + "\n")
+            out.flush()
+    finally:
+        if args.output:
+            out.close()
+    if args.compare:
+        compare(rows, args.compare)
+
+if __name__ == "__main__":
+    main()
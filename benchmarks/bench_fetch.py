@@ -0,0 +1,121 @@
+"""
+Upstream fetch benchmark against the offline Binance stand-in.
+
+Starts benchmarks.binance_stub in-process on a free port, points
+dataSource.binanceData at it and times the symbol list, kline paging
+(sequential and concurrent) and /chart with a cold and a warm candle store.
+Output is JSON lines in the same format as bench_analytics:
+
+    python -m benchmarks.bench_fetch --latency 0.05 --output fetch.jsonl
+"""
+import argparse
+import contextlib
+import json
+import shutil
+import sys
+import tempfile
+import threading
+from functools import partial
+
+from werkzeug.serving import make_server
+
+from benchmarks.bench_analytics import checksum, compare, measure
+from benchmarks.binance_stub import SyntheticMarket, create_app
+from dataSource import binanceData
+from dataSource.candleStore import CandleStore
+
+# Fixed server clock so every run sees the same candles
+STUB_NOW_MS = 1_735_689_600_000  # 2025-01-01
+
+def startStub(latency, jitter, errorRate, seed):
+    app = create_app(SyntheticMarket(seed=seed), latency=latency, jitter=jitter, error_rate=errorRate,
+                     seed=seed, now=STUB_NOW_MS)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def targets(symbol, start, end, workers):
+    import main
+    from main import app, candle_store
+
+    app.config['LOGIN_DISABLED'] = True
+    client = app.test_client()
+    startTs = binanceData.to_timestamp_ms(start)
+    endTs = binanceData.to_timestamp_ms(end)
+    warm = tempfile.mkdtemp(prefix='bench-store-')
+
+    def chart(storeDir):
+        def call():
+            directory = storeDir or tempfile.mkdtemp(prefix='bench-store-')
+            main.candle_store = CandleStore(f'{directory}/candles.db',
+                                            fetcher=partial(binanceData.fetch_binance_klines, concurrent=True,
+                                                            max_workers=workers))
+            # The view prints the candles; keep stdout for the JSON lines
+            try:
+                with app.app_context(), contextlib.redirect_stdout(sys.stderr):
+                    response = client.get(f'/chart?symbol={symbol}&startDate={start}&endDate={end}')
+            finally:
+                main.candle_store = candle_store
+                if storeDir is None:
+                    shutil.rmtree(directory, ignore_errors=True)
+            if response.status_code != 200:
+                raise RuntimeError(f'/chart returned {response.status_code}')
+            return response.data
+        return call
+
+    return {
+        'get_all_binance_symbols': lambda: binanceData.get_all_binance_symbols().to_dict(orient='records'),
+        'fetch_binance_klines': lambda: binanceData.fetch_binance_klines(symbol, startTs, endTs).to_numpy(),
+        'fetch_binance_klines:concurrent': lambda: binanceData.fetch_binance_klines(
+            symbol, startTs, endTs, concurrent=True, max_workers=workers).to_numpy(),
+        'route:/chart:cold': chart(None),
+        'route:/chart:warm': chart(warm),
+    }, warm
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--end', default='2024-07-01')
+    parser.add_argument('--workers', type=int, default=4, help='threads for concurrent paging')
+    parser.add_argument('--latency', type=float, default=0.0, help='stub seconds per response')
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per target, best is kept')
+    parser.add_argument('--only', action='append', help='substring filter on target names (repeatable)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write JSON lines here instead of stdout')
+    parser.add_argument('--compare', help='baseline JSON lines file to compare against')
+    args = parser.parse_args(argv)
+
+    server = startStub(args.latency, args.jitter, args.error_rate, args.seed)
+    binanceData.BINANCE_BASE_URL = f'http://127.0.0.1:{server.server_port}'
+    fns, warm = targets(args.symbol, args.start, args.end, args.workers)
+    out = open(args.output, 'w') if args.output else sys.stdout
+    rows = []
+    try:
+        for name, fn in fns.items():
+            if args.only and not any(o in name for o in args.only):
+                continue
+            seconds, peak, result = measure(fn, args.repeat)
+            row = {
+                'target': name,
+                'size': f'{args.start}..{args.end}',
+                'seconds': round(seconds, 6),
+                'peak_bytes': peak,
+                'checksum': checksum(result),
+                'latency': args.latency,
+            }
+            rows.append(row)
+            out.write(json.dumps(row) + '\n')
+            out.flush()
+    finally:
+        if args.output:
+            out.close()
+        server.shutdown()
+        shutil.rmtree(warm, ignore_errors=True)
+    if args.compare:
+        compare(rows, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+JSON serialization benchmark.
+
+Encodes the payloads of the JSON routes (/analyze, /getGap, /indicators,
+/volume) for synthetic series of several sizes with the previous path
+(Flask's default provider after tolist()/to_dict conversions) and with
+fastjson.NumpyJSONProvider on the stdlib and orjson backends. Analytics are
+computed once up front, so only conversion + encoding is timed. Output is
+JSON lines in the same format as bench_analytics; the checksum is taken
+over the decoded JSON, so equal checksums mean equal responses:
+
+    python -m benchmarks.bench_json --sizes 10000,100000
+"""
+import argparse
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import fastjson
+from analatics.functions import analyze, getGaps
+from analatics.indicators import getIndicators
+from analatics.volume import VolumeIndex
+from benchmarks.bench_analytics import INDICATORS, checksum, compare, measure, syntheticCandles
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+def legacyArrays(results):
+    # What the routes did before the provider: NaN -> None through tolist()
+    if isinstance(results, dict):
+        return {key: legacyArrays(value) for key, value in results.items()}
+    return np.where(np.isnan(results), None, results).tolist()
+
+def payloads(data):
+    """(legacy, current) builders per route; each returns the object handed to jsonify."""
+    structure = analyze(data)
+    gaps = getGaps(data)["data"]
+    indicators = getIndicators(data, INDICATORS)
+    volume = VolumeIndex(data)
+    n = len(data)
+    return {
+        "analyze": (lambda: structure, lambda: structure),
+        "getGap": (
+            lambda: {"gap": pd.DataFrame(gaps).to_dict(orient="records")},
+            lambda: {"gap": gaps},
+        ),
+        "indicators": (
+            lambda: {"time": data["time"].tolist(), **legacyArrays(indicators)},
+            lambda: {"time": data["time"].to_numpy(), **indicators},
+        ),
+        "volume": (
+            lambda: {"time": volume.time.tolist(), "volume": volume.volume(0, n),
+                     **legacyArrays({"vwapLine": volume.vwapLine(0, n), "cvd": volume.cvd(0, n),
+                                     "profile": volume.profile(0, n)})},
+            lambda: {"time": volume.time, "volume": volume.volume(0, n),
+                     "vwapLine": volume.vwapLine(0, n), "cvd": volume.cvd(0, n),
+                     "profile": volume.profile(0, n)},
+        ),
+    }
+
+def encoders():
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    found = {"legacy": lambda obj: default.dumps(obj).encode()}
+    stdlib = fastjson.NumpyJSONProvider(app, use_orjson=False)
+    found["numpy-stdlib"] = stdlib.dumpb
+    if fastjson.orjson is not None:
+        found["numpy-orjson"] = fastjson.NumpyJSONProvider(app).dumpb
+    return found
+
+def run(sizes, repeat, only, seed):
+    encode = encoders()
+    for size in sizes:
+        data = syntheticCandles(size, seed)
+        for route, (legacy, current) in payloads(data).items():
+            for name, dumpb in encode.items():
+                build = legacy if name == "legacy" else current
+                target = f"encode:{route}:{name}"
+                if only and not any(o in target for o in only):
+                    continue
+                seconds, peak, result = measure(lambda: dumpb(build()), repeat)
+                yield {
+                    "target": target,
+                    "size": size,
+                    "seconds": round(seconds, 6),
+                    "peak_bytes": peak,
+                    "checksum": checksum(json.loads(result)),
+                    "bytes": len(result),
+                }
+
+def summary(rows):
+    legacy = {(r["target"].rsplit(":", 1)[0], r["size"]): r for r in rows if r["target"].endswith(":legacy")}
+    print(f"{'target':32} {'size':>9} {'seconds':>10} {'speedup':>8} {'memory':>7}  checksum", file=sys.stderr)
+    for row in rows:
+        base = legacy.get((row["target"].rsplit(":", 1)[0], row["size"]))
+        if base is None or base is row:
+            continue
+        speedup = base["seconds"] / row["seconds"] if row["seconds"] else float("nan")
+        memory = row["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] else float("nan")
+        same = "same" if row["checksum"] == base["checksum"] else "CHANGED"
+        print(f"{row['target']:32} {row['size']:>9} {row['seconds']:>10.4f} {speedup:>7.2f}x {memory:>6.2f}x  {same}",
+              file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",")], default=DEFAULT_SIZES,
+                        help="comma separated candle counts (default 1000,10000,100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per target, best is kept")
+    parser.add_argument("--only", action="append", help="substring filter on target names (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON lines here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON lines file to compare against")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    rows = []
+    try:
+        for row in run(args.sizes, args.repeat, args.only, args.seed):
+            rows.append(row)
+            out.write(json.dumps(row) + "\n")
+            out.flush()
+    finally:
+        if args.output:
+            out.close()
+    summary(rows)
+    if args.compare:
+        compare(rows, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Offline stand-in for the parts of the Binance REST API this app uses.
+
+Serves /api/v3/exchangeInfo and /api/v3/klines with Binance's paging rules
+(startTime/endTime/limit, at most 1000 klines per request, request weight
+reported in X-MBX-USED-WEIGHT-1M, 429 + Retry-After past the limit) from
+deterministic synthetic candles or recorded kline dumps, with optional
+latency and error injection. Point the app at it with BINANCE_BASE_URL:
+
+    python -m benchmarks.binance_stub --port 8001 --latency 0.05 --error-rate 0.01
+    BINANCE_BASE_URL=http://127.0.0.1:8001 python main.py
+"""
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+import zlib
+
+import numpy as np
+from flask import Flask, jsonify, request
+
+from dataSource.binanceData import get_interval_ms
+
+INTERVALS = ['1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '8h', '12h', '1d', '3d', '1w', '1M']
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+# Listing dates are spread over this window so early ranges page like real symbols
+LISTING_START_MS = 1_500_000_000_000
+LISTING_SPREAD_MS = 150_000_000_000
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60 * 1000
+
+_MASK = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+def _mix(x):
+    """splitmix64 finaliser: uint64 array -> well spread uint64 array."""
+    with np.errstate(over='ignore'):
+        x = (x + np.uint64(0x9E3779B97F4A7C15)) & _MASK
+        x = ((x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK
+        x = ((x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK
+        return x ^ (x >> np.uint64(31))
+
+def _uniform(key, times):
+    """Deterministic uniform [0, 1) per (key, time)."""
+    with np.errstate(over='ignore'):
+        x = _mix(np.asarray(times, dtype=np.int64).astype(np.uint64) ^ np.uint64(key))
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+class SyntheticMarket:
+    """
+    Deterministic candles for any symbol/interval/time, computed in O(1) per
+    candle without generating history: the price path is a sum of slow
+    sinusoids with symbol-seeded phases, and wicks and volume come from a
+    hash of symbol and open time. The same request always returns the same
+    candles and each open equals the previous close.
+    """
+
+    def __init__(self, symbols=200, seed=0):
+        self.seed = seed
+        quotes = ['USDT', 'BTC', 'ETH', 'BUSD']
+        self.symbols = [
+            {
+                'symbol': f'SYM{i:04d}{quotes[i % len(quotes)]}',
+                'status': 'BREAK' if i % 17 == 16 else 'TRADING',
+                'baseAsset': f'SYM{i:04d}',
+                'quoteAsset': quotes[i % len(quotes)],
+            }
+            for i in range(symbols)
+        ]
+        for name in ('BTCUSDT', 'ETHUSDT', 'BNBUSDT'):
+            self.symbols.insert(0, {'symbol': name, 'status': 'TRADING',
+                                    'baseAsset': name[:-4], 'quoteAsset': 'USDT'})
+        self._known = {s['symbol'] for s in self.symbols}
+
+    def __contains__(self, symbol):
+        return symbol in self._known
+
+    def _key(self, symbol):
+        return zlib.crc32(f'{self.seed}:{symbol}'.encode())
+
+    def listed_at(self, symbol):
+        """First open time (ms) with candles for the symbol."""
+        if symbol in ('BTCUSDT', 'ETHUSDT', 'BNBUSDT'):
+            return LISTING_START_MS
+        return LISTING_START_MS + int(_uniform(self._key(symbol), [0])[0] * LISTING_SPREAD_MS) // 60000 * 60000
+
+    def _price(self, key, times):
+        t = np.asarray(times, dtype=np.float64) / 86_400_000.0  # days
+        phases = _uniform(key, [1, 2, 3]) * 2 * np.pi
+        level = 50 + 950 * _uniform(key, [4])[0]
+        wave = (0.30 * np.sin(t / 97.0 + phases[0]) + 0.12 * np.sin(t / 13.0 + phases[1])
+                + 0.04 * np.sin(t / 1.7 + phases[2]))
+        return level * np.exp(wave)
+
+    def klines(self, symbol, interval, open_times, now_ms):
+        """Binance kline rows (lists of 12 fields) for the given open times."""
+        key = self._key(symbol)
+        open_times = np.asarray(open_times, dtype=np.int64)
+        close_times = next_open(open_times, interval) - 1
+        open_ = self._price(key, open_times)
+        # The still forming candle closes at "now"
+        close = self._price(key, np.minimum(close_times + 1, now_ms))
+        spread = np.abs(close - open_) + open_ * 0.002
+        high = np.maximum(open_, close) + spread * _uniform(key ^ 0x1, open_times)
+        low = np.minimum(open_, close) - spread * _uniform(key ^ 0x2, open_times)
+        volume = 1000 * _uniform(key ^ 0x3, open_times) * (close_times - open_times + 1) / 60000
+        trades = (volume * 3).astype(np.int64)
+        return [
+            [int(t), f'{o:.8f}', f'{h:.8f}', f'{l:.8f}', f'{c:.8f}', f'{v:.8f}', int(ct),
+             f'{v * (o + c) / 2:.8f}', int(n), f'{v / 2:.8f}', f'{v * (o + c) / 4:.8f}', '0']
+            for t, o, h, l, c, v, ct, n in zip(open_times, open_, high, low, close, volume, close_times, trades)
+        ]
+
+class RecordedMarket:
+    """
+    Klines replayed from dumps of real responses: one JSON file per
+    symbol/interval named <SYMBOL>_<interval>.json holding a list of kline rows.
+    """
+
+    def __init__(self, directory):
+        self._rows = {}
+        for path in glob.glob(os.path.join(directory, '*_*.json')):
+            symbol, interval = os.path.basename(path)[:-len('.json')].rsplit('_', 1)
+            with open(path) as f:
+                rows = sorted(json.load(f), key=lambda row: row[0])
+            self._rows[(symbol, interval)] = (np.array([row[0] for row in rows], dtype=np.int64), rows)
+        self.symbols = [
+            {'symbol': symbol, 'status': 'TRADING', 'baseAsset': symbol, 'quoteAsset': ''}
+            for symbol in sorted({symbol for symbol, _ in self._rows})
+        ]
+
+    def __contains__(self, symbol):
+        return symbol in {s['symbol'] for s in self.symbols}
+
+    def page(self, symbol, interval, start, end, limit):
+        times, rows = self._rows.get((symbol, interval), (np.empty(0, dtype=np.int64), []))
+        hi = int(np.searchsorted(times, end, side='right'))
+        if start is None:
+            return rows[max(0, hi - limit):hi]
+        lo = int(np.searchsorted(times, start, side='left'))
+        return rows[lo:max(lo, min(hi, lo + limit))]
+
+def next_open(open_times, interval):
+    """Open time of the following candle."""
+    if interval.endswith('M'):
+        months = open_times.astype('datetime64[ms]').astype('datetime64[M]') + int(interval[:-1])
+        return months.astype('datetime64[ms]').astype(np.int64)
+    return open_times + get_interval_ms(interval)
+
+def open_times_between(start, end, interval, limit, from_end=False):
+    """Up to `limit` candle open times in [start, end], aligned to the interval grid."""
+    if end < start:
+        return np.empty(0, dtype=np.int64)
+    if interval.endswith('M'):
+        step = int(interval[:-1])
+        first = np.datetime64(int(start), 'ms').astype('datetime64[M]')
+        if first.astype('datetime64[ms]').astype(np.int64) < start:
+            first += 1
+        last = np.datetime64(int(end), 'ms').astype('datetime64[M]')
+        months = np.arange(first, last + 1, step)
+        times = months.astype('datetime64[ms]').astype(np.int64)
+    else:
+        step = get_interval_ms(interval)
+        offset = WEEK_OFFSET_MS if interval.endswith('w') else 0
+        first = -(-(start - offset) // step) * step + offset
+        last = (end - offset) // step * step + offset
+        if last < first:
+            return np.empty(0, dtype=np.int64)
+        count = (last - first) // step + 1
+        if count > limit:
+            first = last - (limit - 1) * step if from_end else first
+            count = limit
+        times = first + step * np.arange(count, dtype=np.int64)
+    return times[-limit:] if from_end else times[:limit]
+
+def _error(status, code, msg):
+    response = jsonify({'code': code, 'msg': msg})
+    response.status_code = status
+    return response
+
+def create_app(market=None, latency=0.0, jitter=0.0, error_rate=0.0, weight_limit=6000, seed=0, now=None):
+    """
+    Build the stand-in Flask app.
+
+    Parameters:
+        market: SyntheticMarket (default) or RecordedMarket.
+        latency (float): Seconds added to every response.
+        jitter (float): Extra uniformly random latency, up to this many seconds.
+        error_rate (float): Fraction of requests answered with a 5xx or a 429.
+        weight_limit (int): Request weight per minute before answering 429.
+        seed (int): Seed for the injected latency/errors.
+        now (int): Fixed server time in epoch ms, for fully repeatable runs.
+    """
+    app = Flask(__name__)
+    market = market or SyntheticMarket(seed=seed)
+    rng = np.random.default_rng(seed)
+    lock = threading.Lock()
+    weight = {'minute': None, 'used': 0}
+
+    def server_time():
+        return int(time.time() * 1000) if now is None else now
+
+    def charge(cost):
+        # Binance counts weight per IP per minute; one client per stub here
+        with lock:
+            minute = int(time.time() // 60)
+            if weight['minute'] != minute:
+                weight['minute'] = minute
+                weight['used'] = 0
+            weight['used'] += cost
+            used = weight['used']
+            draw = rng.random(3)
+        if used > weight_limit:
+            response = _error(429, -1003, 'Too much request weight used; current limit is '
+                                          f'{weight_limit} request weight per 1 MINUTE.')
+            response.headers['Retry-After'] = str(60 - int(time.time()) % 60)
+        elif draw[0] < error_rate:
+            response = (_error(429, -1003, 'Injected rate limit.') if draw[1] < 0.3
+                        else _error(503, -1001, 'Injected internal error; unable to process your request.'))
+            if response.status_code == 429:
+                response.headers['Retry-After'] = '1'
+        else:
+            response = None
+        delay = latency + jitter * draw[2]
+        if delay > 0:
+            time.sleep(delay)
+        return response, used
+
+    @app.after_request
+    def weight_header(response):
+        response.headers['X-MBX-USED-WEIGHT-1M'] = str(weight['used'])
+        return response
+
+    @app.route('/api/v3/ping')
+    def ping():
+        return jsonify({})
+
+    @app.route('/api/v3/time')
+    def server_clock():
+        return jsonify({'serverTime': server_time()})
+
+    @app.route('/api/v3/exchangeInfo')
+    def exchange_info():
+        error, _ = charge(20)
+        if error is not None:
+            return error
+        return jsonify({
+            'timezone': 'UTC',
+            'serverTime': server_time(),
+            'rateLimits': [{'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE',
+                            'intervalNum': 1, 'limit': weight_limit}],
+            'symbols': market.symbols,
+        })
+
+    @app.route('/api/v3/klines')
+    def klines():
+        error, _ = charge(2)
+        if error is not None:
+            return error
+        symbol = request.args.get('symbol', '')
+        interval = request.args.get('interval', '')
+        if not symbol:
+            return _error(400, -1102, "Mandatory parameter 'symbol' was not sent, was empty/null, or malformed.")
+        if interval not in INTERVALS:
+            return _error(400, -1120, 'Invalid interval.')
+        if symbol not in market:
+            return _error(400, -1121, 'Invalid symbol.')
+        try:
+            limit = int(request.args.get('limit', DEFAULT_LIMIT))
+            start = request.args.get('startTime', type=int)
+            end = request.args.get('endTime', type=int)
+        except ValueError:
+            return _error(400, -1100, 'Illegal characters found in a parameter.')
+        limit = max(1, min(limit, MAX_LIMIT))
+        if start is not None and end is not None and start > end:
+            return _error(400, -1023, 'Start time is greater than end time.')
+
+        current = server_time()
+        if isinstance(market, RecordedMarket):
+            return jsonify(market.page(symbol, interval, start, current if end is None else end, limit))
+
+        # Nothing before listing or after the candle open at "now"
+        first = market.listed_at(symbol)
+        last = current if end is None else min(end, current)
+        if start is None:
+            # Without startTime Binance returns the most recent `limit` klines
+            times = open_times_between(first, last, interval, limit, from_end=True)
+        else:
+            times = open_times_between(max(start, first), last, interval, limit)
+        return jsonify(market.klines(symbol, interval, times, current))
+
+    return app
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Offline Binance REST stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--symbols', type=int, default=200, help='synthetic symbols besides BTC/ETH/BNB')
+    parser.add_argument('--recorded', help='directory of <SYMBOL>_<interval>.json kline dumps to replay')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random latency, up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered 5xx/429')
+    parser.add_argument('--weight-limit', type=int, default=6000, help='request weight per minute')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--now', type=int, help='fixed server time in epoch ms')
+    args = parser.parse_args(argv)
+
+    market = RecordedMarket(args.recorded) if args.recorded else SyntheticMarket(args.symbols, args.seed)
+    app = create_app(market, args.latency, args.jitter, args.error_rate, args.weight_limit, args.seed, args.now)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+if __name__ == '__main__':
+    main()
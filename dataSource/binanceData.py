@@ -1,6 +1,69 @@
+import os
 import requests
+import numpy as np
 import pandas as pd
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from dataSource import httpSession
+
+# Point at a stand-in (e.g. python -m benchmarks.binance_stub) with BINANCE_BASE_URL=http://127.0.0.1:8001
+BINANCE_BASE_URL = os.environ.get('BINANCE_BASE_URL', 'https://api.binance.com').rstrip('/')
+MAX_RECORDS_PER_REQUEST = 1000  # Binance's limit
+# Binance allows 6000 request weight per minute per IP; klines with limit=1000 cost 2
+WEIGHT_LIMIT_PER_MINUTE = 6000
+WEIGHT_HEADROOM = 0.8
+KLINES_WEIGHT = 2
+
+def get_session(pool_size=8):
+    """Shared keep-alive session so repeated requests reuse pooled connections"""
+    return httpSession.get_session('binance', pool_size=pool_size)
+
+class RequestWeightGate:
+    """
+    Keeps request weight under Binance's per-minute limit.
+
+    Tracks the weight reported in the X-MBX-USED-WEIGHT-1M header (plus what
+    is in flight), makes callers wait for the next minute when close to the
+    limit, and honours Retry-After on 429/418 responses.
+    """
+
+    def __init__(self, limit=WEIGHT_LIMIT_PER_MINUTE, headroom=WEIGHT_HEADROOM):
+        self.budget = int(limit * headroom)
+        self._used = 0
+        self._minute = int(time.time() // 60)
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, weight):
+        while True:
+            with self._lock:
+                now = time.time()
+                if int(now // 60) != self._minute:
+                    self._minute = int(now // 60)
+                    self._used = 0
+                if now >= self._blocked_until and self._used + weight <= self.budget:
+                    self._used += weight
+                    return
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    wait = (self._minute + 1) * 60 - now
+            time.sleep(max(wait, 0.05))
+
+    def update(self, response):
+        with self._lock:
+            used = response.headers.get('X-MBX-USED-WEIGHT-1M')
+            if used is not None and int(time.time() // 60) == self._minute:
+                self._used = max(self._used, int(used))
+            if response.status_code in (418, 429):
+                retry_after = float(response.headers.get('Retry-After', 60))
+                self._blocked_until = max(self._blocked_until, time.time() + retry_after)
+                return False
+        return True
+
+weight_gate = RequestWeightGate()
 
 def get_all_binance_symbols():
     """
@@ -9,7 +72,7 @@ def get_all_binance_symbols():
     """
     try:
         # Binance API endpoint for exchange information
-        url = "https://api.binance.com/api/v3/exchangeInfo"
+        url = f"{BINANCE_BASE_URL}/api/v3/exchangeInfo"
         
         # Make the GET request
         response = requests.get(url)
@@ -38,7 +101,7 @@ def get_all_binance_symbols():
         print(f"Error fetching data from Binance API: {e}")
         return []
     
-def fetch_binance_ohlc(symbol, start_date, end_date, interval='15m'):
+def fetch_binance_ohlc(symbol, start_date, end_date, interval='15m', concurrent=False):
     """
     Fetch OHLC data from Binance API for a given symbol and date range
     
@@ -50,74 +113,123 @@ def fetch_binance_ohlc(symbol, start_date, end_date, interval='15m'):
                        Options: '1m', '5m', '15m', '30m', '1h', '2h', '4h', 
                                 '6h', '8h', '12h', '1d', '3d', '1w', '1M'
     
+        concurrent (bool): Fetch the 1000-candle pages in parallel (see fetch_binance_klines)
+    
     Returns:
         pd.DataFrame: DataFrame with OHLC data and volume
     """
-    # Convert dates to timestamp in milliseconds
-    if isinstance(start_date, str):
-        start_date = datetime.strptime(start_date, '%Y-%m-%d')
-    if isinstance(end_date, str):
-        end_date = datetime.strptime(end_date, '%Y-%m-%d')
-    
-    start_ts = int(start_date.timestamp() * 1000)
-    end_ts = int(end_date.timestamp() * 1000)
+    try:
+        return fetch_binance_klines(symbol, to_timestamp_ms(start_date), to_timestamp_ms(end_date), interval,
+                                    concurrent=concurrent)
     
-    base_url = "https://api.binance.com/api/v3/klines"
-    all_data = []
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching OHLC data: {e}")
+        return pd.DataFrame()
+
+def to_timestamp_ms(date):
+    """'YYYY-MM-DD' string or datetime to epoch milliseconds (naive datetimes are local time)"""
+    if isinstance(date, str):
+        date = datetime.strptime(date, '%Y-%m-%d')
+    return int(date.timestamp() * 1000)
+
+def get_klines_page(symbol, interval, start_ts, end_ts, retries=3):
+    """One klines request through the shared session and request-weight gate"""
+    base_url = f"{BINANCE_BASE_URL}/api/v3/klines"
+    params = {
+        'symbol': symbol,
+        'interval': interval,
+        'startTime': start_ts,
+        'endTime': end_ts,
+        'limit': MAX_RECORDS_PER_REQUEST
+    }
+    for attempt in range(retries + 1):
+        weight_gate.acquire(KLINES_WEIGHT)
+        response = get_session().get(base_url, params=params)
+        if weight_gate.update(response) or attempt == retries:
+            break
+    response.raise_for_status()
+    return response.json()
+
+def page_bounds(start_ts, end_ts, interval):
+    """Split [start_ts, end_ts] into consecutive ranges of at most 1000 candles"""
+    span = MAX_RECORDS_PER_REQUEST * get_interval_ms(interval)
+    return [(a, min(a + span - 1, end_ts)) for a in range(start_ts, end_ts, span)]
+
+KLINE_COLUMNS = {'Open': 1, 'High': 2, 'Low': 3, 'Close': 4, 'Volume': 5}
+
+def decode_klines(payload, price_dtype=np.float64):
+    """
+    Decode a Binance klines JSON payload straight into typed NumPy columns.
+
+    Only open time and OHLCV are read (the other seven fields are skipped), one
+    column at a time, so nothing row-wise goes through pandas.
+
+    Parameters:
+        payload (list): Klines as returned by /api/v3/klines (list of lists).
+        price_dtype: dtype for the Open/High/Low/Close columns, e.g. np.float32
+                     to halve their memory. Volume stays float64.
+
+    Returns:
+        dict: {'time': int64 epoch-ms array, 'Open', 'High', 'Low', 'Close', 'Volume'}
+    """
+    columns = {'time': np.fromiter((row[0] for row in payload), dtype=np.int64, count=len(payload))}
+    for name, position in KLINE_COLUMNS.items():
+        dtype = np.float64 if name == 'Volume' else price_dtype
+        columns[name] = np.array([row[position] for row in payload], dtype=np.float64).astype(dtype, copy=False)
+    return columns
+
+def concat_klines(pages):
+    """Concatenate decoded pages (already in time order), keeping the last copy of any open time"""
+    if not pages:
+        return decode_klines([])
+    columns = {name: np.concatenate([page[name] for page in pages]) for name in pages[0]}
+    times = columns['time']
+    keep = np.append(times[1:] != times[:-1], True) if len(times) else np.ones(0, dtype=bool)
+    if not keep.all():
+        columns = {name: values[keep] for name, values in columns.items()}
+    return columns
+
+def fetch_binance_klines(symbol, start_ts, end_ts, interval='15m', concurrent=False, max_workers=4,
+                         price_dtype=np.float64):
+    """
+    Fetch candles whose open time is in [start_ts, end_ts] (epoch ms).
+
+    Same output as fetch_binance_ohlc, but request errors are raised instead of
+    returning an empty DataFrame, so callers can tell "no data" from "failed".
+
+    With concurrent=True all page boundaries are computed up front and fetched
+    by up to `max_workers` threads over the pooled session, then merged in
+    time order. Each page is decoded with decode_klines as it arrives.
+    """
+    pages = []
     
-    current_start = start_ts
-    max_records_per_request = 1000  # Binance's limit
+    if concurrent:
+        bounds = page_bounds(start_ts, end_ts, interval)
+        get_session(max(max_workers, 1))
+        fetch_page = lambda page: decode_klines(get_klines_page(symbol, interval, *page), price_dtype)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map() yields in submission order, so pages come back already sorted
+            pages = list(executor.map(fetch_page, bounds))
+    else:
+        current_start = start_ts
     
-    try:
         while current_start < end_ts:
             # Calculate end timestamp for this batch
-            current_end = min(current_start + max_records_per_request * get_interval_ms(interval), end_ts)
-            
-            params = {
-                'symbol': symbol,
-                'interval': interval,
-                'startTime': current_start,
-                'endTime': current_end,
-                'limit': max_records_per_request
-            }
+            current_end = min(current_start + MAX_RECORDS_PER_REQUEST * get_interval_ms(interval), end_ts)
             
-            response = requests.get(base_url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = get_klines_page(symbol, interval, current_start, current_end)
             
             if not data:
                 break
                 
-            all_data.extend(data)
+            pages.append(decode_klines(data, price_dtype))
             
             # Move window forward
             current_start = int(data[-1][0]) + get_interval_ms(interval)
-            
-        # Process the data into a DataFrame
-        columns = [
-            'time', 'Open', 'High', 'Low', 'Close', 'Volume',
-            'Close time', 'Quote asset volume', 'Number of trades',
-            'Taker buy base volume', 'Taker buy quote volume', 'Ignore'
-        ]
-        
-        df = pd.DataFrame(all_data, columns=columns)
-        
-        # Convert timestamp to datetime
-        df['time'] = pd.to_datetime(df['time'], unit='ms')
-        df['Close time'] = pd.to_datetime(df['Close time'], unit='ms')
-        
-        # Convert strings to numeric values
-        numeric_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-        df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, axis=1)
         
-        # Filter only the relevant columns
-        df = df[['time', 'Open', 'High', 'Low', 'Close', 'Volume']]
-        
-        return df
-    
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching OHLC data: {e}")
-        return pd.DataFrame()
+    columns = concat_klines(pages)
+    columns['time'] = pd.to_datetime(columns['time'], unit='ms')
+    return pd.DataFrame(columns)
 
 def get_interval_ms(interval):
     """Convert interval string to milliseconds"""
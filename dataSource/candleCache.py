@@ -0,0 +1,143 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+def window(data, start=None, end=None):
+    """Rows of a time-sorted candle DataFrame with start <= time <= end."""
+    if start is None and end is None:
+        return data
+    times = data["time"].to_numpy()
+    lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+    hi = len(times) if end is None else int(np.searchsorted(times, end, side="right"))
+    return data.iloc[lo:hi].reset_index(drop=True)
+
+class CandleCache:
+    """
+    Bounded in-memory LRU cache of candle DataFrames.
+
+    Series are keyed by symbol/interval/date range and handed out as a short
+    opaque handle, so the chart can reference candles the server already holds
+    instead of posting them back for every analytics call.
+
+    Parameters:
+        max_entries (int): Series kept; least recently used are evicted.
+        max_candles (int): Total candles kept across all series.
+        max_derived (int): Derived objects kept per series, least recently used first out.
+    """
+
+    def __init__(self, max_entries=32, max_candles=2_000_000, max_derived=8):
+        self.max_entries = max_entries
+        self.max_candles = max_candles
+        self.max_derived = max_derived
+        self._entries = OrderedDict()
+        self._keys = {}
+        self._candles = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_handle(symbol, interval, start, end):
+        """Deterministic handle for a symbol/interval/range."""
+        key = f"{symbol}|{interval}|{start}|{end}"
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def put(self, symbol, interval, start, end, data):
+        """
+        Store a candle DataFrame (sorted by 'time') and return its handle.
+        Least recently used series are evicted past the entry/candle limits.
+        """
+        handle = self.make_handle(symbol, interval, start, end)
+        with self._lock:
+            previous = self._entries.pop(handle, None)
+            if previous is not None:
+                self._candles -= len(previous[0])
+            # Candles plus anything derived from them (indexes, analytics state)
+            self._entries[handle] = (data, OrderedDict())
+            self._keys[handle] = (symbol, interval)
+            self._candles += len(data)
+            self._evict()
+        return handle
+
+    def _evict(self):
+        # Called with the lock held; the most recently used series always stays
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._candles > self.max_candles
+        ):
+            evictedHandle, (evicted, _) = self._entries.popitem(last=False)
+            self._keys.pop(evictedHandle, None)
+            self._candles -= len(evicted)
+
+    def describe(self, handle):
+        """(symbol, interval) a handle was stored under, or None if unknown/evicted."""
+        with self._lock:
+            return self._keys.get(handle) if handle in self._entries else None
+
+    def extend(self, handle, rows):
+        """
+        Append candles to a cached series, replacing any stored candles at or
+        after the first new time (e.g. the still forming one). Derived objects
+        are dropped since they describe the old series.
+
+        Returns:
+            bool: False if the handle is unknown or was evicted.
+        """
+        if len(rows) == 0:
+            return handle in self
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return False
+            data = entry[0]
+            keep = int(np.searchsorted(data["time"].to_numpy(), rows["time"].iloc[0], side="left"))
+            extended = pd.concat([data.iloc[:keep], rows[data.columns]], ignore_index=True)
+            self._entries[handle] = (extended, OrderedDict())
+            self._entries.move_to_end(handle)
+            self._candles += len(extended) - len(data)
+            self._evict()
+        return True
+
+    def get(self, handle, start=None, end=None):
+        """
+        Candles for a handle, optionally limited to start <= time <= end.
+
+        Returns:
+            pd.DataFrame or None: None if the handle is unknown or was evicted.
+        """
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return None
+            self._entries.move_to_end(handle)
+
+        return window(entry[0], start, end)
+
+    def derived(self, handle, key, factory):
+        """
+        Object built from a cached series (e.g. a prefix-sum index), created
+        once with factory(data) and evicted together with the series. At most
+        `max_derived` objects are kept per series.
+
+        Returns:
+            object or None: None if the handle is unknown or was evicted.
+        """
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return None
+            self._entries.move_to_end(handle)
+            data, derived = entry
+            if key in derived:
+                derived.move_to_end(key)
+                return derived[key]
+        value = factory(data)
+        with self._lock:
+            derived[key] = value
+            while len(derived) > self.max_derived:
+                derived.popitem(last=False)
+        return value
+
+    def __contains__(self, handle):
+        with self._lock:
+            return handle in self._entries
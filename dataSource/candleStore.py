@@ -0,0 +1,155 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataSource.binanceData import fetch_binance_klines, get_interval_ms, to_timestamp_ms
+from dataSource.columnStore import ColumnSeries
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_coverage_key ON coverage (symbol, interval);
+"""
+
+def subtract_ranges(start, end, covered):
+    """Parts of [start, end) not inside any of the sorted, merged `covered` ranges."""
+    missing = []
+    cursor = start
+    for a, b in covered:
+        if b <= cursor:
+            continue
+        if a >= end:
+            break
+        if a > cursor:
+            missing.append((cursor, a))
+        cursor = max(cursor, b)
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+def merge_ranges(ranges):
+    """Union of half-open ranges as a sorted list of non-overlapping ranges."""
+    merged = []
+    for a, b in sorted(ranges):
+        if merged and a <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+        else:
+            merged.append((a, b))
+    return merged
+
+class CandleStore:
+    """
+    Local on-disk candle store keyed by symbol/interval.
+
+    Candles live in memory-mapped column files (see ColumnSeries) under
+    `columns_dir`, next to the SQLite file by default. The database records
+    which open-time ranges are held (half-open [start, end) in epoch ms), so
+    a request only goes upstream for the sub-ranges that are missing. Candles
+    that had not closed yet when they were fetched are never marked as held,
+    so they are refreshed next time.
+    """
+
+    def __init__(self, path, fetcher=fetch_binance_klines, columns_dir=None):
+        self.path = path
+        self.fetcher = fetcher
+        self.columns_dir = columns_dir or os.path.join(os.path.dirname(os.path.abspath(path)), 'candles')
+        self._lock = threading.Lock()
+        self._series = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def series(self, symbol, interval):
+        """Column files for a symbol/interval."""
+        with self._lock:
+            key = (symbol, interval)
+            if key not in self._series:
+                self._series[key] = ColumnSeries(self.columns_dir, symbol, interval)
+            return self._series[key]
+
+    def coverage(self, symbol, interval):
+        """Held open-time ranges for a symbol/interval, sorted and merged."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT start, end FROM coverage WHERE symbol = ? AND interval = ? ORDER BY start",
+                (symbol, interval),
+            ).fetchall()
+        return [tuple(r) for r in rows]
+
+    def missing(self, symbol, interval, start_ts, end_ts):
+        """Open-time ranges in [start_ts, end_ts] (ms, inclusive) not held locally."""
+        return subtract_ranges(start_ts, end_ts + 1, self.coverage(symbol, interval))
+
+    def save(self, symbol, interval, data, start_ts, end_ts):
+        """
+        Store candles (fetch_binance_ohlc format) fetched for [start_ts, end_ts]
+        and mark that range as held, up to the last closed candle.
+        """
+        step = get_interval_ms(interval)
+        self.series(symbol, interval).write({
+            'time': _epoch_ms(data['time']),
+            'open': data['Open'], 'high': data['High'], 'low': data['Low'],
+            'close': data['Close'], 'volume': data['Volume'],
+        })
+        # The candle open at "now" is still forming
+        closed_before = (int(time.time() * 1000) // step) * step if step else end_ts + 1
+        held_end = min(end_ts + 1, closed_before)
+
+        with self._lock, self._connect() as conn:
+            if held_end > start_ts:
+                ranges = conn.execute(
+                    "SELECT start, end FROM coverage WHERE symbol = ? AND interval = ?",
+                    (symbol, interval),
+                ).fetchall()
+                merged = merge_ranges([tuple(r) for r in ranges] + [(start_ts, held_end)])
+                conn.execute("DELETE FROM coverage WHERE symbol = ? AND interval = ?", (symbol, interval))
+                conn.executemany(
+                    "INSERT INTO coverage VALUES (?, ?, ?, ?)",
+                    [(symbol, interval, a, b) for a, b in merged],
+                )
+
+    def columns(self, symbol, interval, start_ts=None, end_ts=None):
+        """
+        Stored candles with open time in [start_ts, end_ts] as memory-mapped
+        column views ('time' in epoch ms), without copying anything.
+        """
+        return self.series(symbol, interval).read(start_ts, end_ts)
+
+    def load(self, symbol, interval, start_ts, end_ts):
+        """Stored candles with open time in [start_ts, end_ts], fetch_binance_ohlc format."""
+        columns = self.columns(symbol, interval, start_ts, end_ts)
+        # Viewing epoch ms as datetime64[ms] keeps the frame backed by the maps
+        return pd.DataFrame({
+            'time': columns['time'].view('datetime64[ms]'),
+            'Open': columns['open'],
+            'High': columns['high'],
+            'Low': columns['low'],
+            'Close': columns['close'],
+            'Volume': columns['volume'],
+        }, copy=False)
+
+    def fetch(self, symbol, start_date, end_date, interval='15m'):
+        """
+        fetch_binance_ohlc backed by the store: only the missing open-time
+        ranges are requested upstream, the rest is read from disk.
+        """
+        start_ts = to_timestamp_ms(start_date)
+        end_ts = to_timestamp_ms(end_date)
+        for a, b in self.missing(symbol, interval, start_ts, end_ts):
+            fetched = self.fetcher(symbol, a, b - 1, interval)
+            self.save(symbol, interval, fetched, a, b - 1)
+        return self.load(symbol, interval, start_ts, end_ts)
+
+def _epoch_ms(times):
+    return ((pd.to_datetime(times) - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)).to_numpy(dtype=np.int64)
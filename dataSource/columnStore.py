@@ -0,0 +1,121 @@
+import os
+import re
+import threading
+
+import numpy as np
+
+# Fixed-width column files, one per field; rows share the same position in every file
+COLUMNS = {
+    'time': np.int64,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64,
+}
+
+def _safe_name(name):
+    return re.sub(r'[^A-Za-z0-9._-]', '_', str(name))
+
+class ColumnSeries:
+    """
+    Append-friendly columnar candle file set for one symbol/interval.
+
+    Each field is a raw little-endian array in its own file
+    (<root>/<symbol>/<interval>/<field>.bin), sorted by open time in epoch ms.
+    Reads memory-map the files and slice them with a binary search on time,
+    so a window only touches the pages it covers and the returned arrays are
+    views, not copies.
+
+    Writes that start at or after the existing tail are written in place and
+    appended (the usual case: newer candles plus a refresh of the last, still
+    forming, one). Anything else is merged and the files are replaced
+    atomically, so open memory maps keep seeing the old, consistent data.
+    """
+
+    def __init__(self, root, symbol, interval):
+        self.path = os.path.join(root, _safe_name(symbol), _safe_name(interval))
+        self._lock = threading.Lock()
+
+    def _file(self, field):
+        return os.path.join(self.path, f'{field}.bin')
+
+    def __len__(self):
+        # The shortest column wins, so a write interrupted midway is ignored
+        sizes = []
+        for field, dtype in COLUMNS.items():
+            try:
+                sizes.append(os.path.getsize(self._file(field)) // np.dtype(dtype).itemsize)
+            except FileNotFoundError:
+                return 0
+        return min(sizes)
+
+    def _map(self, field, length):
+        if length == 0:
+            return np.empty(0, dtype=COLUMNS[field])
+        return np.memmap(self._file(field), dtype=COLUMNS[field], mode='r', shape=(length,))
+
+    def read(self, start_ts=None, end_ts=None):
+        """
+        Columns with start_ts <= time <= end_ts (epoch ms, inclusive).
+
+        Returns:
+            dict: {field: np.ndarray} read-only memory-mapped views.
+        """
+        with self._lock:
+            length = len(self)
+            columns = {field: self._map(field, length) for field in COLUMNS}
+        times = columns['time']
+        lo = 0 if start_ts is None else int(np.searchsorted(times, start_ts, side='left'))
+        hi = length if end_ts is None else int(np.searchsorted(times, end_ts, side='right'))
+        hi = max(lo, hi)
+        return {field: values[lo:hi] for field, values in columns.items()}
+
+    def write(self, columns):
+        """
+        Insert or replace candles by open time.
+
+        Parameters:
+            columns (dict): {field: array-like} for every field in COLUMNS,
+                            sorted by 'time' (epoch ms) without duplicates.
+        """
+        new = {field: np.ascontiguousarray(columns[field], dtype=dtype) for field, dtype in COLUMNS.items()}
+        if len(new['time']) == 0:
+            return
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            length = len(self)
+            times = self._map('time', length)
+            at = int(np.searchsorted(times, new['time'][0], side='left'))
+            tail = times[at:]
+            # In place when the new block covers every stored time from `at` on
+            if length == 0 or (tail.size <= new['time'].size and
+                               np.array_equal(tail, new['time'][:tail.size])):
+                del times, tail
+                self._write_at(at, new)
+            else:
+                del times, tail
+                self._rewrite(length, new)
+
+    def _write_at(self, position, new):
+        # Time last, so a partial write never exposes rows without prices.
+        # Files only ever grow here: shrinking one under a live memory map
+        # would fault the reader.
+        for field in sorted(COLUMNS, key=lambda f: f == 'time'):
+            mode = 'r+b' if os.path.exists(self._file(field)) else 'wb'
+            with open(self._file(field), mode) as f:
+                f.seek(position * new[field].itemsize)
+                f.write(new[field].tobytes())
+
+    def _rewrite(self, length, new):
+        old = {field: np.array(self._map(field, length)) for field in COLUMNS}
+        times = np.concatenate((new['time'], old['time']))
+        # Stable sort with the new rows first, then keep the first of each time
+        order = np.argsort(times, kind='stable')
+        sorted_times = times[order]
+        keep = order[np.concatenate(([True], sorted_times[1:] != sorted_times[:-1]))]
+        for field in COLUMNS:
+            merged = np.concatenate((new[field], old[field]))[keep]
+            tmp = self._file(field) + '.tmp'
+            merged.tofile(tmp)
+            os.replace(tmp, self._file(field))
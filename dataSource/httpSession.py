@@ -0,0 +1,30 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(key, headers=None, pool_size=8):
+    """
+    Shared keep-alive session per upstream, so repeated requests reuse pooled
+    connections. The first call for a key creates it; `headers` and
+    `pool_size` only apply then.
+
+    Parameters:
+        key (str): Upstream name, e.g. 'binance' or 'yahoo'.
+        headers (dict): Default headers sent with every request.
+        pool_size (int): Connections kept per host.
+    """
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            if headers:
+                session.headers.update(headers)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _sessions[key] = session
+        return session
@@ -0,0 +1,91 @@
+import time
+
+import numpy as np
+
+from dataSource.binanceData import get_interval_ms, get_klines_page
+
+class FakeKlineFeed:
+    """
+    Local kline source for tests and demos.
+
+    Continues a series from its last candle with a seeded random walk. Each
+    candle is reported `ticks` times while forming and then once closed, one
+    report every `period` seconds, so a 15m candle "lasts" ticks * period
+    seconds of wall time.
+    """
+
+    def __init__(self, period=1.0, ticks=4, seed=0):
+        self.period = period
+        self.ticks = ticks
+        self.seed = seed
+
+    def stream(self, symbol, interval, last, stop):
+        """
+        Yield lists of kline updates until `stop` (threading.Event) is set.
+
+        Parameters:
+            last (dict): Last candle held, {'time': epoch ms, 'close': price}, or None.
+
+        Yields:
+            list: {'time' (open, epoch ms), 'open', 'high', 'low', 'close',
+            'volume', 'closed'} dicts, oldest first.
+        """
+        step = get_interval_ms(interval)
+        rng = np.random.default_rng(self.seed)
+        openTime = (last['time'] + step) if last else int(time.time() * 1000) // step * step
+        price = last['close'] if last else 100.0
+        while not stop.is_set():
+            candle = {'time': openTime, 'open': price, 'high': price, 'low': price, 'close': price,
+                      'volume': 0.0, 'closed': False}
+            for tick in range(self.ticks + 1):
+                if stop.wait(self.period):
+                    return
+                price = max(price * (1 + rng.normal(0, 0.002)), 1e-8)
+                candle.update(
+                    high=max(candle['high'], price),
+                    low=min(candle['low'], price),
+                    close=price,
+                    volume=candle['volume'] + float(rng.random() * 10),
+                    closed=tick == self.ticks,
+                )
+                yield [dict(candle)]
+            openTime += step
+
+class BinancePollingFeed:
+    """
+    Kline updates polled from the Binance REST API (or the stand-in at
+    BINANCE_BASE_URL) every `poll` seconds, through the shared session and
+    request-weight gate.
+    """
+
+    def __init__(self, poll=5.0):
+        self.poll = poll
+
+    def stream(self, symbol, interval, last, stop):
+        """Same contract as FakeKlineFeed.stream."""
+        since = last['time'] if last else int(time.time() * 1000) - get_interval_ms(interval)
+        while not stop.is_set():
+            now = int(time.time() * 1000)
+            try:
+                rows = get_klines_page(symbol, interval, since, now)
+            except Exception as e:
+                print(f"Error polling klines for {symbol}: {e}")
+                rows = []
+            updates = [
+                {
+                    'time': int(row[0]),
+                    'open': float(row[1]),
+                    'high': float(row[2]),
+                    'low': float(row[3]),
+                    'close': float(row[4]),
+                    'volume': float(row[5]),
+                    'closed': int(row[6]) < now,
+                }
+                for row in rows
+            ]
+            if updates:
+                yield updates
+                # Re-poll from the oldest candle that can still change
+                forming = [u['time'] for u in updates if not u['closed']]
+                since = forming[0] if forming else updates[-1]['time'] + get_interval_ms(interval)
+            stop.wait(self.poll)
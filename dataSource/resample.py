@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+from dataSource.binanceData import get_interval_ms
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+DAY_MS = 24 * 60 * 60 * 1000
+# Binance weeks open on Monday 00:00 UTC; the epoch fell on a Thursday
+WEEK_OFFSET_MS = 4 * DAY_MS
+
+def _months(interval):
+    return int(interval[:-1]) if interval.endswith('M') else 0
+
+def can_resample(base_interval, interval):
+    """True if `interval` bars can be built exactly from `base_interval` candles."""
+    base = get_interval_ms(base_interval)
+    if not base or _months(base_interval):
+        return False
+    if _months(interval):
+        return DAY_MS % base == 0
+    step = get_interval_ms(interval)
+    if not step or step < base or step % base:
+        return False
+    # Weeks are aligned to Monday, so the base has to line up with days
+    return not interval.endswith('w') or DAY_MS % base == 0
+
+def bucket_bounds(times, interval):
+    """
+    Open time of the `interval` bar each epoch-ms time falls in, and the
+    open time of the bar after it.
+
+    Returns:
+        tuple: (start, end) int64 arrays.
+    """
+    times = np.asarray(times, dtype=np.int64)
+    months = _months(interval)
+    if months:
+        index = times.astype('datetime64[ms]').astype('datetime64[M]').astype(np.int64)
+        index -= index % months
+        start = index.astype('datetime64[M]').astype('datetime64[ms]').astype(np.int64)
+        end = (index + months).astype('datetime64[M]').astype('datetime64[ms]').astype(np.int64)
+        return start, end
+    step = get_interval_ms(interval)
+    offset = WEEK_OFFSET_MS if interval.endswith('w') else 0
+    start = (times - offset) // step * step + offset
+    return start, start + step
+
+def resample_columns(columns, interval, base_interval, first_time=None):
+    """
+    Aggregate base candles into `interval` bars.
+
+    Open is the first base open, close the last base close, high/low the
+    extremes and volume the sum. A bar is flagged incomplete when the base
+    candles do not cover its whole span: the bar still forming at the end,
+    or a leading bar whose start precedes the data.
+
+    Parameters:
+        columns (dict): 'time' (epoch ms, sorted) and open/high/low/close/volume arrays.
+        interval (str): Target interval, e.g. '1h', '4h', '1d', '1w', '1M'.
+        base_interval (str): Interval of the base candles, e.g. '15m'.
+        first_time (int): Earliest base time held, if `columns` is a tail of a
+                          longer series (defaults to the first time given).
+
+    Returns:
+        dict: 'time' (bar open, epoch ms), open/high/low/close/volume and a
+        boolean 'complete' array.
+    """
+    if not can_resample(base_interval, interval):
+        raise ValueError(f"Cannot build {interval} bars from {base_interval} candles")
+    times = np.asarray(columns['time'], dtype=np.int64)
+    if len(times) == 0:
+        empty = {'time': np.empty(0, dtype=np.int64), 'complete': np.empty(0, dtype=bool)}
+        empty.update({field: np.empty(0) for field in FIELDS})
+        return empty
+
+    start, end = bucket_bounds(times, interval)
+    first = np.flatnonzero(np.concatenate(([True], start[1:] != start[:-1])))
+    last = np.concatenate((first[1:], [len(times)])) - 1
+    open_ = np.asarray(columns['open'])
+    close = np.asarray(columns['close'])
+
+    first_time = times[0] if first_time is None else first_time
+    covered_until = times[-1] + get_interval_ms(base_interval)
+    return {
+        'time': start[first],
+        'open': open_[first],
+        'high': np.maximum.reduceat(np.asarray(columns['high']), first),
+        'low': np.minimum.reduceat(np.asarray(columns['low']), first),
+        'close': close[last],
+        'volume': np.add.reduceat(np.asarray(columns['volume'], dtype=float), first),
+        'complete': (start[first] >= first_time) & (end[first] <= covered_until),
+    }
+
+def resample_ohlc(data, interval, base_interval='15m'):
+    """
+    resample_columns for a fetch_binance_ohlc style DataFrame
+    ('time' datetime, Open/High/Low/Close/Volume). Returns the same layout
+    plus a 'Complete' column.
+    """
+    times = (pd.to_datetime(data['time']) - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)
+    bars = resample_columns({
+        'time': times.to_numpy(dtype=np.int64),
+        'open': data['Open'].to_numpy(dtype=float),
+        'high': data['High'].to_numpy(dtype=float),
+        'low': data['Low'].to_numpy(dtype=float),
+        'close': data['Close'].to_numpy(dtype=float),
+        'volume': data['Volume'].to_numpy(dtype=float),
+    }, interval, base_interval)
+    return pd.DataFrame({
+        'time': pd.to_datetime(bars['time'], unit='ms'),
+        'Open': bars['open'],
+        'High': bars['high'],
+        'Low': bars['low'],
+        'Close': bars['close'],
+        'Volume': bars['volume'],
+        'Complete': bars['complete'],
+    })
+
+class Resampler:
+    """
+    Incremental resampler for a live base candle series.
+
+    Only the base candles of the bar still forming are kept; each update
+    re-aggregates those plus the new candles, so the cost is proportional to
+    the update, not to the history. A base candle with the same open time as
+    the last one seen replaces it (a refreshed, still forming candle).
+    """
+
+    def __init__(self, interval, base_interval):
+        if not can_resample(base_interval, interval):
+            raise ValueError(f"Cannot build {interval} bars from {base_interval} candles")
+        self.interval = interval
+        self.base_interval = base_interval
+        self._first_time = None
+        self._pending = {'time': np.empty(0, dtype=np.int64)}
+        self._pending.update({field: np.empty(0) for field in FIELDS})
+        self._closed = []
+
+    def update(self, columns):
+        """
+        Add base candles (sorted, not before the last one seen).
+
+        Returns:
+            dict: The bars touched by this update, as from resample_columns;
+            all but the last are closed for good.
+        """
+        times = np.asarray(columns['time'], dtype=np.int64)
+        if len(times) == 0:
+            return resample_columns(self._pending, self.interval, self.base_interval, self._first_time)
+        pending = self._pending['time']
+        if len(pending) and times[0] < pending[-1]:
+            raise ValueError("Base candles must not be older than the last one received")
+        if self._first_time is None:
+            self._first_time = int(times[0])
+
+        keep = int(np.searchsorted(pending, times[0], side='left'))
+        combined = {field: np.concatenate((self._pending[field][:keep], np.asarray(columns[field])))
+                    for field in ('time',) + FIELDS}
+        combined['time'] = combined['time'].astype(np.int64)
+        bars = resample_columns(combined, self.interval, self.base_interval, self._first_time)
+
+        # Everything before the last bar is closed; keep the last bar's base candles
+        if len(bars['time']) > 1:
+            self._closed.append({field: values[:-1] for field, values in bars.items()})
+        start, _ = bucket_bounds(combined['time'], self.interval)
+        tail = int(np.searchsorted(start, bars['time'][-1], side='left'))
+        self._pending = {field: values[tail:] for field, values in combined.items()}
+        return bars
+
+    def bars(self):
+        """All bars so far, closed ones followed by the one still forming."""
+        current = resample_columns(self._pending, self.interval, self.base_interval, self._first_time)
+        if len(self._closed) > 1:
+            self._closed = [{field: np.concatenate([part[field] for part in self._closed])
+                             for field in current}]
+        parts = self._closed + [current]
+        return {field: np.concatenate([part[field] for part in parts]) for field in current}
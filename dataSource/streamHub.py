@@ -0,0 +1,186 @@
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from analatics.series import SeriesAnalytics
+from dataSource.binanceData import get_interval_ms
+from dataSource.resample import FIELDS, Resampler, can_resample
+
+class StreamHub:
+    """
+    Fans live kline updates out to Server-Sent Event subscribers.
+
+    One worker thread per (handle, pivot interval) reads a feed (see
+    dataSource/klineFeed.py) for the handle's symbol/interval. Closed candles
+    are appended to the cached series and to an incremental SeriesAnalytics,
+    and each subscriber queue receives only what changed: the updated candles
+    and the new swings, resolved breaks and new or moved gaps. The worker
+    stops once its last subscriber leaves.
+
+    Series on an interval that can be built from `base_interval` (e.g. 1h
+    from 15m) stream base candles and aggregate them with a Resampler, the
+    same way the chart resampled them from the candle store.
+    """
+
+    def __init__(self, cache, feed, queue_size=256, base_interval=None):
+        self.cache = cache
+        self.feed = feed
+        self.base_interval = base_interval
+        self.queue_size = queue_size
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, handle, pivot=2):
+        """
+        Returns:
+            queue.Queue or None: Event dicts for this subscriber (None ends
+            the stream), or None if the handle is unknown or was evicted.
+        """
+        key = (handle, pivot)
+        events = queue.Queue(self.queue_size)
+        with self._lock:
+            channel = self._channels.get(key)
+            if channel is None:
+                described = self.cache.describe(handle)
+                data = self.cache.get(handle)
+                if described is None or data is None:
+                    return None
+                channel = _Channel(self, key, described, data)
+                self._channels[key] = channel
+                channel.subscribers.append(events)
+                channel.start()
+            else:
+                channel.subscribers.append(events)
+        return events
+
+    def unsubscribe(self, handle, pivot, events):
+        with self._lock:
+            channel = self._channels.get((handle, pivot))
+            if channel is None:
+                return
+            if events in channel.subscribers:
+                channel.subscribers.remove(events)
+            if not channel.subscribers:
+                channel.stop.set()
+                del self._channels[(handle, pivot)]
+
+    def _publish(self, channel, event):
+        with self._lock:
+            subscribers = list(channel.subscribers)
+        for events in subscribers:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                # A client that stopped reading is dropped rather than buffered forever
+                self.unsubscribe(channel.key[0], channel.key[1], events)
+
+class _Channel(threading.Thread):
+
+    def __init__(self, hub, key, described, data):
+        super().__init__(daemon=True)
+        self.hub = hub
+        self.key = key
+        self.symbol, self.interval = described
+        self.subscribers = []
+        self.stop = threading.Event()
+        # Cached chart candles are in epoch seconds; only closed ones feed the analytics
+        self.step = get_interval_ms(self.interval) // 1000
+        closed = data["time"].to_numpy() + self.step <= time.time()
+        self.analytics = SeriesAnalytics(data[closed].reset_index(drop=True), interval=key[1])
+        self.last = None
+        if len(data):
+            self.last = {'time': int(data["time"].iloc[-1]) * 1000, 'close': float(data["close"].iloc[-1])}
+
+        self.feed_interval = self.interval
+        self.resampler = None
+        base = hub.base_interval
+        if base and base != self.interval and can_resample(base, self.interval):
+            # Stream base candles from the open of the last (possibly forming) bar on
+            self.feed_interval = base
+            self.resampler = Resampler(self.interval, base)
+            self.base_from = self.last['time'] if self.last else 0
+            if self.last:
+                self.last = {'time': self.base_from - get_interval_ms(base),
+                             'close': float(data["open"].iloc[-1])}
+
+    def run(self):
+        try:
+            for updates in self.hub.feed.stream(self.symbol, self.feed_interval, self.last, self.stop):
+                if self.stop.is_set():
+                    break
+                event = self.apply(updates)
+                if event is not None:
+                    self.hub._publish(self, event)
+        except Exception as e:
+            print(f"Kline stream for {self.symbol} {self.interval} failed: {e}")
+        finally:
+            with self.hub._lock:
+                subscribers = list(self.subscribers)
+                if self.hub._channels.get(self.key) is self:
+                    del self.hub._channels[self.key]
+            for events in subscribers:
+                try:
+                    events.put_nowait(None)
+                except queue.Full:
+                    pass
+
+    def apply(self, updates):
+        """Turn feed updates into one delta event (None if nothing changed)."""
+        if self.resampler is not None:
+            updates = self.resample(updates)
+            if not updates:
+                return None
+        rows = pd.DataFrame(updates)
+        rows["time"] = rows["time"] // 1000
+        if len(self.analytics):
+            # Anything up to the last closed candle is already final
+            rows = rows[rows["time"] > self.analytics.column("time")[-1]]
+        if rows.empty:
+            return None
+
+        candles = rows[["time", "open", "high", "low", "close", "volume"]].reset_index(drop=True)
+        if not self.hub.cache.extend(self.key[0], candles):
+            self.stop.set()
+            return None
+
+        event = {"candles": candles.to_dict(orient="records"), "swingHigh": [], "swingLow": [],
+                 "breakHigh": [], "breakLow": [], "gap": []}
+        closed = candles[rows["closed"].to_numpy()]
+        if len(closed):
+            delta = self.analytics.append(closed.reset_index(drop=True))
+            event["swingHigh"], event["swingLow"] = _swings(delta["pivots"])
+            event["breakHigh"] = delta["breakHigh"]
+            event["breakLow"] = delta["breakLow"]
+            event["gap"] = delta["gaps"]
+        return event
+
+    def resample(self, updates):
+        """Base candle updates -> updates of the bars they fall in."""
+        # Polling re-sends candles before the bar being rebuilt; those bars are final
+        updates = [u for u in updates if u['time'] >= self.base_from]
+        if not updates:
+            return []
+        bars = self.resampler.update({field: np.array([u[field] for u in updates])
+                                      for field in ('time',) + FIELDS})
+        n = len(bars['time'])
+        # Every bar but the last is closed; the last once fully covered by closed base candles
+        lastClosed = bool(bars['complete'][-1]) and updates[-1]['closed']
+        return [
+            {'time': int(bars['time'][i]), **{field: float(bars[field][i]) for field in FIELDS},
+             'closed': i < n - 1 or lastClosed}
+            for i in range(n)
+        ]
+
+def _swings(pivots):
+    # getPivots style records -> the {time, startIndex, endIndex, value} shape of /swings
+    high, low = [], []
+    for record in pivots:
+        swing = {"time": record["index"], "startIndex": record["startIndex"], "endIndex": record["endIndex"]}
+        if record["isSwingHigh"] is not None:
+            high.append({**swing, "value": record["isSwingHigh"]})
+        if record["isSwingLow"] is not None:
+            low.append({**swing, "value": record["isSwingLow"]})
+    return high, low
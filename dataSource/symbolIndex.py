@@ -0,0 +1,142 @@
+import bisect
+import threading
+
+class SymbolIndex:
+    """
+    In-memory prefix index over the ticker catalog for search-as-you-type.
+
+    Two sorted lists of (key, symbol, exchange) tuples are kept: one keyed by
+    the casefolded symbol and one by every word of the casefolded name. A
+    prefix query is a bisect to the first key >= prefix followed by a short
+    forward scan, so lookups never touch the database.
+
+    The index is filled once from the database (ensure_loaded) and then kept
+    in step by the catalog sync through update() and remove(): small changes
+    are inserted/deleted in place, large ones rebuild the lists with one sort.
+    """
+
+    # Above this share of changed records a full re-sort beats in-place edits
+    REBUILD_RATIO = 0.1
+
+    def __init__(self):
+        self.loaded = False
+        self._records = {}
+        self._symbols = []
+        self._words = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def ensure_loaded(self, fetch):
+        """
+        Build the index on first use.
+
+        Parameters:
+            fetch (callable): Returns (symbol, name, exchange) rows of the listed catalog.
+                              Called under the index lock, so a concurrent update()
+                              either lands before the read or is applied after it.
+        """
+        with self._lock:
+            if self.loaded:
+                return
+            self._records = {(symbol, exchange): _clean(name) for symbol, name, exchange in fetch()}
+            self._rebuild()
+            self.loaded = True
+
+    def update(self, rows):
+        """
+        Add or replace records.
+
+        Parameters:
+            rows (list): (symbol, name, exchange) tuples that were inserted or changed.
+        """
+        with self._lock:
+            if not self.loaded:
+                # Nothing to patch yet; ensure_loaded will read the committed rows
+                return
+            changes = {(symbol, exchange): _clean(name) for symbol, name, exchange in rows}
+            if len(changes) > self.REBUILD_RATIO * max(len(self._records), 1):
+                self._records.update(changes)
+                self._rebuild()
+                return
+            for key, name in changes.items():
+                if key in self._records:
+                    self._discard(key, self._records[key])
+                self._records[key] = name
+                for entry in _symbolEntries(key):
+                    bisect.insort(self._symbols, entry)
+                for entry in _wordEntries(key, name):
+                    bisect.insort(self._words, entry)
+
+    def remove(self, keys):
+        """
+        Drop records.
+
+        Parameters:
+            keys (list): (symbol, exchange) tuples no longer listed.
+        """
+        with self._lock:
+            if not self.loaded:
+                return
+            keys = [key for key in keys if key in self._records]
+            if len(keys) > self.REBUILD_RATIO * max(len(self._records), 1):
+                for key in keys:
+                    del self._records[key]
+                self._rebuild()
+                return
+            for key in keys:
+                self._discard(key, self._records.pop(key))
+
+    def search(self, query, limit=20, exchange=None):
+        """
+        Records whose symbol, or any word of whose name, starts with `query`.
+
+        Symbol matches come first (an exact symbol before longer ones), then
+        name matches, each in key order and without duplicates.
+
+        Returns:
+            list: {'symbol', 'name', 'exchange'} dicts, at most `limit`.
+        """
+        prefix = query.strip().casefold()
+        if not prefix or limit <= 0:
+            return []
+        results = []
+        seen = set()
+        with self._lock:
+            for entries in (self._symbols, self._words):
+                i = bisect.bisect_left(entries, (prefix,))
+                while i < len(entries) and entries[i][0].startswith(prefix):
+                    _, symbol, market = entries[i]
+                    i += 1
+                    if (exchange and market != exchange) or (symbol, market) in seen:
+                        continue
+                    seen.add((symbol, market))
+                    results.append({'symbol': symbol, 'name': self._records[(symbol, market)] or None,
+                                    'exchange': market})
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def _rebuild(self):
+        self._symbols = sorted(entry for key in self._records for entry in _symbolEntries(key))
+        self._words = sorted(entry for key, name in self._records.items() for entry in _wordEntries(key, name))
+
+    def _discard(self, key, name):
+        for entries, old in ((self._symbols, _symbolEntries(key)), (self._words, _wordEntries(key, name))):
+            for entry in old:
+                i = bisect.bisect_left(entries, entry)
+                if i < len(entries) and entries[i] == entry:
+                    del entries[i]
+
+def _clean(name):
+    # Names come from pandas records and may be NaN/None
+    return name if isinstance(name, str) else ''
+
+def _symbolEntries(key):
+    symbol, exchange = key
+    return [(symbol.casefold(), symbol, exchange)]
+
+def _wordEntries(key, name):
+    symbol, exchange = key
+    return [(word, symbol, exchange) for word in set(name.casefold().split())]
@@ -1,11 +1,102 @@
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from dataSource import httpSession
 from tqdm import tqdm
 import yfinance as yf
 
-def get_all_yfinance_tickers():
+try:
+    import lxml  # noqa: F401  (C parser backend for BeautifulSoup)
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+YAHOO_BASE_URL = "https://finance.yahoo.com"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+def get_session(pool_size=8):
+    """Shared keep-alive session for Yahoo pages"""
+    return httpSession.get_session('yahoo', HEADERS, pool_size)
+
+class TokenBucket:
+    """
+    Token bucket: up to `burst` requests at once, refilled at `rate` per second.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class HostRateLimiter:
+    """One TokenBucket per host, created on first use"""
+
+    def __init__(self, rate=4.0, burst=8):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._buckets.setdefault(host, TokenBucket(self.rate, self.burst))
+        bucket.acquire()
+
+def scrape_ticker_table(html, asset_class, config, quiet=False):
+    """
+    Ticker rows from one Yahoo list page.
+
+    Only <table> elements are parsed (SoupStrainer), with lxml when installed.
+
+    Returns:
+        list: {'Symbol', 'Name', 'Asset Class'} dicts in page order.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=SoupStrainer('table'))
+    table = soup.find('table', {'data-test': config['table_id']})
+    if not table:
+        table = soup.find('table')  # fallback
+
+    tickers = []
+    if table:
+        rows = table.find_all('tr')[1:]  # Skip header row
+        for row in tqdm(rows, desc=f"Processing {asset_class}", disable=quiet):
+            cols = row.find_all('td', limit=2)
+            if len(cols) > 1:
+                symbol = cols[0].get_text(' ', strip=True)
+                name = cols[1].get_text(' ', strip=True)
+
+                # Add appropriate suffix if needed
+                if config['suffix'] and not symbol.endswith(config['suffix']):
+                    symbol += config['suffix']
+
+                tickers.append({
+                    'Symbol': symbol,
+                    'Name': name,
+                    'Asset Class': asset_class.capitalize()
+                })
+    return tickers
+
+def get_all_yfinance_tickers(concurrent=False, max_workers=4, rate=4.0, burst=8, quiet=False):
     """
     Scrapes tickers for all major asset classes from Yahoo Finance including:
     - Stocks
@@ -14,13 +105,18 @@ def get_all_yfinance_tickers():
     - Indices
     - Currency exchange rates
     Returns a DataFrame with symbols, names, and asset classes.
+
+    Parameters:
+        concurrent (bool): Fetch the pages with up to `max_workers` threads
+        rate (float): Requests per second allowed per host (token bucket)
+        burst (int): Requests per host allowed back to back
+        quiet (bool): No progress output or bars
+
+    Pages go through a pooled session and a per-host token bucket in both
+    modes; results are combined in the same order either way.
     """
     # Configuration
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    base_url = "https://finance.yahoo.com"
-    delay = 1  # seconds between requests
+    base_url = YAHOO_BASE_URL
     
     # Enhanced asset class configurations
     asset_classes = {
@@ -55,60 +151,35 @@ def get_all_yfinance_tickers():
         }
     }
     
-    all_tickers = []
-    
-    for asset_class, config in asset_classes.items():
-        for endpoint in config['urls']:
-            url = f"{base_url}{endpoint}"
-            try:
+    limiter = HostRateLimiter(rate, burst)
+    session = get_session(max(max_workers, 1))
+    pages = [
+        (asset_class, config, f"{base_url}{endpoint}")
+        for asset_class, config in asset_classes.items()
+        for endpoint in config['urls']
+    ]
+
+    def scrape(page):
+        asset_class, config, url = page
+        try:
+            if not quiet:
                 print(f"\nScraping {asset_class} from {url}...")
-                response = requests.get(url, headers=headers)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Handle currency pairs differently
-                # if asset_class == 'currencies':
-                #     # Currency pairs are in a different structure
-                #     currency_pairs = soup.find_all('a', {'class': 'Fw(600)'})
-                #     for pair in tqdm(currency_pairs, desc="Processing currencies"):
-                #         symbol = pair.text.strip()
-                #         name = symbol.replace('=X', '') + ' Exchange Rate'
-                #         all_tickers.append({
-                #             'Symbol': symbol,
-                #             'Name': name,
-                #             'Asset Class': 'Currency'
-                #         })
-                #     continue
-                
-                # Standard table processing for other asset classes
-                table = soup.find('table', {'data-test': config['table_id']})
-                if not table:
-                    table = soup.find('table')  # fallback
-                
-                if table:
-                    rows = table.find_all('tr')[1:]  # Skip header row
-                    for row in tqdm(rows, desc=f"Processing {asset_class}"):
-                        cols = row.find_all('td')
-                        if len(cols) > 1:
-                            symbol = cols[0].text.strip()
-                            name = cols[1].text.strip() if len(cols) > 1 else ''
-                            
-                            # Add appropriate suffix if needed
-                            if config['suffix'] and not symbol.endswith(config['suffix']):
-                                symbol += config['suffix']
-                            
-                            all_tickers.append({
-                                'Symbol': symbol,
-                                'Name': name,
-                                'Asset Class': asset_class.capitalize()
-                            })
-                
-                time.sleep(delay)
-                
-            except Exception as e:
+            limiter.acquire(url)
+            response = session.get(url)
+            response.raise_for_status()
+            return scrape_ticker_table(response.text, asset_class, config, quiet)
+        except Exception as e:
+            if not quiet:
                 print(f"Error scraping {url}: {str(e)}")
-                continue
+            return []
+
+    if concurrent:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map() keeps page order, so duplicates resolve the same as sequentially
+            results = list(executor.map(scrape, pages))
+    else:
+        results = [scrape(page) for page in pages]
+    all_tickers = [ticker for tickers in results for ticker in tickers]
     
     # Add known important tickers that might be missed
     additional_tickers = [
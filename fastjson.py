@@ -0,0 +1,100 @@
+import json
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder below is used instead
+    orjson = None
+
+class NumpyJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that writes NumPy/pandas values directly.
+
+    With orjson installed, numeric arrays are encoded from their buffers in
+    one call (no per-element Python objects) and dicts/lists of plain values
+    several times faster than the stdlib; NaN and infinities become null.
+    Without it the stdlib encoder is used and arrays go through one
+    tolist(), with NaN also written as null. Either way routes can return
+    ndarrays, Series and DataFrames (as records) as-is.
+
+    Installed with `app.json = NumpyJSONProvider(app)`; jsonify and
+    app.json.dumps then go through it. Request bodies are still parsed by the
+    stdlib (loads is inherited), which accepts the NaN literals orjson rejects.
+    """
+
+    ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                      | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def __init__(self, app, use_orjson=True):
+        super().__init__(app)
+        self.use_orjson = use_orjson and orjson is not None
+
+    def dumpb(self, obj):
+        """Encode to UTF-8 bytes."""
+        if self.use_orjson:
+            return orjson.dumps(obj, default=_orjsonDefault, option=self.ORJSON_OPTIONS)
+        try:
+            return _stdlibDumps(obj)
+        except ValueError:
+            # A NaN/inf float scalar somewhere (np.float64 is a float, so it never reaches
+            # the default hook); null them and encode again, keeping the common case on the C encoder
+            return _stdlibDumps(_finite(obj))
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Explicit json.dumps options (indent, sort_keys, ...) are honoured by the stdlib path
+            kwargs.setdefault('default', _stdlibDefault)
+            return json.dumps(obj, **kwargs)
+        return self.dumpb(obj).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumpb(obj), mimetype=self.mimetype)
+
+def _stdlibDumps(obj):
+    return json.dumps(obj, default=_stdlibDefault, ensure_ascii=False,
+                      separators=(',', ':'), allow_nan=False).encode()
+
+def _finite(value):
+    # Copy of a payload with non-finite floats replaced by None
+    if isinstance(value, float):
+        return value if np.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    if isinstance(value, (np.ndarray, np.generic, pd.Series, pd.Index, pd.DataFrame)):
+        return _finite(_stdlibDefault(value))
+    return value
+
+def _orjsonDefault(value):
+    # Called by orjson for anything it does not encode natively
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in 'biufM' and value.ndim:
+            return np.ascontiguousarray(value)
+        return value.tolist()
+    if isinstance(value, (pd.Series, pd.Index)):
+        return value.to_numpy()
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict(orient='records')
+    if isinstance(value, np.generic):
+        return value.item()
+    return DefaultJSONProvider.default(value)
+
+def _stdlibDefault(value):
+    if isinstance(value, (pd.Series, pd.Index)):
+        value = value.to_numpy()
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == 'f':
+            # NaN is not valid JSON, so warm-up values go out as null
+            return np.where(np.isfinite(value), value, None).tolist()
+        return value.tolist()
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict(orient='records')
+    if isinstance(value, np.generic):
+        value = value.item()
+        return None if isinstance(value, float) and not np.isfinite(value) else value
+    return DefaultJSONProvider.default(value)
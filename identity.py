@@ -0,0 +1,61 @@
+import threading
+import time
+from collections import OrderedDict
+
+class IdentityCache:
+    """
+    Small TTL + LRU cache of logged-in user identities.
+
+    Flask-Login's user_loader runs on every authenticated request; with this
+    cache the database is read at most once per user per `ttl` seconds.
+    Entries are dropped explicitly through invalidate() when a user row
+    changes, so the TTL only bounds staleness from writes made elsewhere.
+
+    Parameters:
+        ttl (float): Seconds an entry is trusted.
+        max_entries (int): Users kept; least recently used are evicted.
+    """
+
+    def __init__(self, ttl=60.0, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Bumped by every invalidation so a load racing with one is not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        """
+        Cached value for key, else loader() (not cached when it returns None).
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+            generation = self._generation
+        value = loader()
+        if value is not None:
+            with self._lock:
+                if generation != self._generation:
+                    return value
+                self._entries[key] = (now + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,136 @@
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+
+class Job:
+    """
+    One unit of background work with its status and progress.
+
+    The function run by the job receives it as first argument and can call
+    `report(progress, message)` to publish how far it got.
+    """
+
+    def __init__(self, name, fn, args, kwargs, key=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.status = 'queued'
+        self.progress = 0.0
+        self.message = None
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    @property
+    def active(self):
+        return self.status in ('queued', 'running')
+
+    def report(self, progress=None, message=None):
+        if progress is not None:
+            self.progress = max(0.0, min(1.0, float(progress)))
+        if message is not None:
+            self.message = message
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'result': self.result,
+            'error': self.error,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+        }
+
+class JobRunner:
+    """
+    In-process background job queue served by a few daemon worker threads.
+
+    Jobs submitted with a `key` are deduplicated: while a job with the same
+    key is queued or running, submitting again returns that job instead of
+    starting another. Finished jobs are kept (up to `history`) so their
+    status can still be looked up.
+
+    Parameters:
+        workers (int): Worker threads.
+        context: Optional callable returning a context manager entered around
+                 every job, e.g. app.app_context for database access.
+    """
+
+    def __init__(self, workers=2, context=None, history=200):
+        self.context = context
+        self.history = history
+        self._queue = queue.Queue()
+        self._jobs = OrderedDict()
+        self._active = {}
+        self._lock = threading.Lock()
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True).start()
+
+    def submit(self, name, fn, *args, key=None, **kwargs):
+        """
+        Queue fn(job, *args, **kwargs).
+
+        Returns:
+            Job: The new job, or the active job already registered under `key`.
+        """
+        with self._lock:
+            if key is not None and key in self._active:
+                return self._active[key]
+            job = Job(name, fn, args, kwargs, key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._active[key] = job
+            self._trim()
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self, key):
+        """Queued or running job for a key, if any."""
+        with self._lock:
+            return self._active.get(key)
+
+    def _trim(self):
+        # Forget the oldest finished jobs beyond the history limit
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            job.status = 'running'
+            job.started = time.time()
+            try:
+                if self.context is not None:
+                    with self.context():
+                        job.result = job.fn(job, *job.args, **job.kwargs)
+                else:
+                    job.result = job.fn(job, *job.args, **job.kwargs)
+                job.progress = 1.0
+                job.status = 'done'
+            except Exception as e:
+                job.error = str(e)
+                job.status = 'failed'
+                traceback.print_exc()
+            finally:
+                job.finished = time.time()
+                with self._lock:
+                    if job.key is not None and self._active.get(job.key) is job:
+                        del self._active[job.key]
+                self._queue.task_done()
@@ -1,40 +1,83 @@
-from flask import Flask, render_template, url_for, request, flash, redirect, jsonify
+from flask import Flask, render_template, url_for, request, flash, redirect, jsonify, abort, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import Session as SASession, object_session
 from flask_wtf import FlaskForm
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from wtforms import StringField, PasswordField, SubmitField
 from wtforms.validators import DataRequired
-from dataSource.binanceData import get_all_binance_symbols,fetch_binance_ohlc
+from dataSource.binanceData import get_all_binance_symbols,fetch_binance_klines
+from dataSource.candleCache import CandleCache, window
+from dataSource.candleStore import CandleStore
+from dataSource.resample import can_resample, resample_ohlc
+from dataSource.klineFeed import BinancePollingFeed, FakeKlineFeed
+from dataSource.streamHub import StreamHub
+from dataSource.symbolIndex import SymbolIndex
 import datetime as dt
-from collections import defaultdict
-import asyncio
+import base64
+import gzip
+import hashlib
 import json
+import queue
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from flask_migrate import Migrate, upgrade, migrate, init, downgrade
 from flask_migrate import Migrate, stamp, upgrade, migrate as _migrate
 import sys
-from analatics.functions import getPivots,getSwingBreaks,getGaps
+import os
+from functools import partial
+from analatics.functions import getSwings,getSwingsMulti,getSwingBreaks,getSwingBreaksMulti,getGaps,analyze,analyzeMulti
+from analatics.indicators import getIndicators
+from analatics.volume import VolumeIndex
+from jobs import JobRunner
+from fastjson import NumpyJSONProvider
+from identity import IdentityCache
 
 
 
 app = Flask(__name__)
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///database.db'
 app.config['SECRET_KEY'] = 'kjaslkdfjasl;kdfjasl;kdflksadfjl;kasdf234243*&^*&'
+# jsonify/request.json go through a NumPy-aware encoder (orjson when installed)
+app.json = NumpyJSONProvider(app)
 db = SQLAlchemy(app)
 chart={}
+candle_cache = CandleCache()
+candle_store = CandleStore(os.path.join(app.instance_path, 'candles.db'),
+                           fetcher=partial(fetch_binance_klines, concurrent=True))
+# TickerData.exchange of the symbols the store fetches candles for
+STORE_EXCHANGE = 'Binance'
+# Interval kept in the store; higher timeframes are resampled from it locally
+BASE_INTERVAL = '15m'
+CHART_INTERVALS = ['15m', '30m', '1h', '4h', '1d', '1w', '1M']
+# Live kline source for /stream; KLINE_FEED=fake uses a local random walk
+stream_hub = StreamHub(candle_cache, FakeKlineFeed() if os.environ.get('KLINE_FEED') == 'fake'
+                       else BinancePollingFeed(), base_interval=BASE_INTERVAL)
+# Background work (catalog refreshes) runs here instead of inside requests
+job_runner = JobRunner(workers=2, context=app.app_context)
+# Prefix index behind /tickers/search, loaded on first use and patched by upsertTickers
+symbol_index = SymbolIndex()
+# Identities resolved by load_user, so authenticated requests skip the users table
+user_cache = IdentityCache(ttl=60)
 login_manager = LoginManager(app)
 login_manager.login_view = 'login'
 login_manager.init_app(app)
 
 class TickerData(db.Model):
+    # One row per symbol and exchange; catalog refreshes upsert against it
+    # (exchange, symbol) serves the per-exchange filter and the keyset order of /tickers
+    __table_args__ = (db.UniqueConstraint('symbol', 'exchange', name='uq_ticker_data_symbol_exchange'),
+                      db.Index('ix_ticker_data_exchange_symbol', 'exchange', 'symbol'))
+
     id = db.Column(db.Integer, primary_key=True)
     symbol = db.Column(db.String(50), nullable=False)
     exchange = db.Column(db.String(50), nullable=False)
     name = db.Column(db.String(100), nullable=True)
     start_date = db.Column(db.DateTime, nullable=True)  # New column
     end_date = db.Column(db.DateTime, nullable=True)    # New column
+    # False once the exchange stops listing the symbol
+    is_active = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     updated_at = db.Column(db.DateTime, 
                          default=db.func.current_timestamp(),
@@ -57,6 +100,33 @@ class User(db.Model, UserMixin):
     def __repr__(self):
         return f'ID: {self.id}, Username: {self.username}'
 
+class SessionUser(UserMixin):
+    # Read-only copy of a User kept in user_cache (no password hash, no session binding)
+    def __init__(self, user):
+        self.id = user.id
+        self.username = user.username
+        self.created_at = user.created_at
+
+    def __repr__(self):
+        return f'ID: {self.id}, Username: {self.username}'
+
+@db.event.listens_for(User, 'after_update')
+@db.event.listens_for(User, 'after_delete')
+def invalidateUser(mapper, connection, target):
+    # Mapper events fire at flush: drop the entry now and again once the commit
+    # lands, so a load between flush and commit cannot keep the old row cached
+    user_cache.invalidate(target.id)
+    object_session(target).info.setdefault('invalidated_users', set()).add(target.id)
+
+@db.event.listens_for(SASession, 'after_commit')
+def invalidateCommittedUsers(session):
+    for user_id in session.info.pop('invalidated_users', ()):
+        user_cache.invalidate(user_id)
+
+@db.event.listens_for(SASession, 'after_soft_rollback')
+def forgetRolledBackUsers(session, previous_transaction):
+    session.info.pop('invalidated_users', None)
+
 class LoginForm(FlaskForm):
      username = StringField('Username', render_kw={'placeholder': 'Enter your username'})
      password = PasswordField('Password', render_kw={'placeholder': 'Enter your password'})
@@ -71,7 +141,13 @@ class RegisterForm(FlaskForm):
 
 @login_manager.user_loader
 def load_user(user_id):
-     return User.query.get(int(user_id))
+     user_id = int(user_id)
+
+     def fetch():
+          user = db.session.get(User, user_id)
+          return SessionUser(user) if user is not None else None
+
+     return user_cache.get(user_id, fetch)
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -120,13 +196,13 @@ def register():
 @app.route('/', methods=['GET', 'POST'])
 @login_required
 def home():
-    # Assuming get_all_yfinance_tickers() returns a Pandas DataFrame
-   
-    user = User.query.get(current_user.id)
-    return render_template('home.html', user=user)
+    # current_user was already resolved (and cached) by load_user
+    return render_template('home.html', user=current_user)
 
 @app.route('/logout', methods=['GET', 'POST'])
 def logout():
+     if current_user.is_authenticated:
+          user_cache.invalidate(current_user.id)
      logout_user()
      flash('Logged out succesfully, please come back again.')
      return redirect(url_for('login'))
@@ -134,53 +210,190 @@ def logout():
 @app.route('/fetch-tickers', methods=['GET'])
 @login_required
 def fetch_tickers():
-    asyncio.run(fetch_and_save_ticker_data())
-    flash("Ticker data is being fetched and saved.")
+    job = startTickerRefresh()
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify(job.to_dict()), 202
+    flash(f"Ticker data is being fetched and saved (job {job.id}).")
     return redirect(url_for('home'))
 
-async def fetch_and_save_ticker_data():
-    # Fetch data asynchronously
-    symbol_df = await asyncio.to_thread(get_all_binance_symbols)
+@app.route('/jobs/<job_id>', methods=['GET'])
+@login_required
+def job_status(job_id):
+    job = job_runner.get(job_id)
+    if job is None:
+        abort(404, description='Unknown job.')
+    return jsonify(job.to_dict())
+
+def startTickerRefresh():
+    # A refresh already queued or running is reused rather than started twice
+    return job_runner.submit('ticker-refresh', fetch_and_save_ticker_data, key='ticker-refresh')
+
+UPSERT_CHUNK = 500
+
+def upsertTickers(records, exchange, report=None):
+    """
+    Sync the catalog for one exchange with a fresh symbol list.
+
+    Existing rows are read once (symbol, name, is_active); only new or
+    changed symbols are written, with one INSERT .. ON CONFLICT DO UPDATE per
+    chunk, and symbols no longer listed are marked inactive with one UPDATE
+    per chunk. The same changes are applied to the in-memory symbol index.
+
+    Parameters:
+        records (list): {'Symbol', 'Name'} dicts from the exchange.
+        exchange (str): TickerData.exchange value for these records.
+
+    Returns:
+        dict: Counts of inserted, updated, delisted and unchanged symbols.
+    """
+    existing = {
+        symbol: (name, active)
+        for symbol, name, active in db.session.query(
+            TickerData.symbol, TickerData.name, TickerData.is_active
+        ).filter_by(exchange=exchange)
+    }
+    fresh = {record['Symbol']: record.get('Name') for record in records}
+
+    inserted = [s for s in fresh if s not in existing]
+    updated = [s for s in fresh if s in existing and existing[s] != (fresh[s], True)]
+    delisted = [s for s, (_, active) in existing.items() if active and s not in fresh]
+    changed = inserted + updated
+
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    steps = max(1, len(changed) + len(delisted))
+    for i in range(0, len(changed), UPSERT_CHUNK):
+        rows = [{'symbol': s, 'exchange': exchange, 'name': fresh[s], 'is_active': True}
+                for s in changed[i:i + UPSERT_CHUNK]]
+        stmt = insert(TickerData).values(rows)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['symbol', 'exchange'],
+            set_={'name': stmt.excluded.name, 'is_active': True,
+                  'updated_at': db.func.current_timestamp()},
+        ))
+        if report:
+            report(i / steps)
+    for i in range(0, len(delisted), UPSERT_CHUNK):
+        db.session.execute(
+            db.update(TickerData)
+            .where(TickerData.exchange == exchange, TickerData.symbol.in_(delisted[i:i + UPSERT_CHUNK]))
+            .values(is_active=False, updated_at=db.func.current_timestamp())
+        )
+        if report:
+            report((len(changed) + i) / steps)
+    db.session.commit()
+    symbol_index.update([(s, fresh[s], exchange) for s in changed])
+    symbol_index.remove([(s, exchange) for s in delisted])
+    return {
+        'inserted': len(inserted),
+        'updated': len(updated),
+        'delisted': len(delisted),
+        'unchanged': len(fresh) - len(changed),
+    }
+
+def fetch_and_save_ticker_data(job=None):
+    report = job.report if job is not None else (lambda *args, **kwargs: None)
+    report(0.0, 'Downloading exchange info')
+    symbol_df = get_all_binance_symbols()
+    if not isinstance(symbol_df, pd.DataFrame):
+        raise RuntimeError('Could not download the Binance symbol list')
+    if symbol_df.empty:
+        # Never read an empty answer as "everything was delisted"
+        raise RuntimeError('Binance returned no symbols')
 
     # Convert the DataFrame to a list of dictionaries
     symbol_data = symbol_df.to_dict('records')
 
     # Save data to the database
-    for record in symbol_data:
-     #    print(record)
-        ticker = TickerData(
-            symbol=record['Symbol'],
-            exchange=record['Asset Class'],
-            name=record.get('Name', None)
-        )
-        db.session.add(ticker)
-    db.session.commit()
-    print("Ticker data saved to the database.")
+    report(0.2, f'Saving {len(symbol_data)} symbols')
+    counts = {}
+    for exchange, records in pd.DataFrame(symbol_data).groupby('Asset Class', sort=False):
+        counts[exchange] = upsertTickers(records.to_dict('records'), exchange,
+                                         lambda done: report(0.2 + 0.8 * done))
+    report(1.0, f'Synced {len(symbol_data)} symbols')
+    print("Ticker data saved to the database.", counts)
+    return counts
 
 @app.route('/saved-tickers', methods=['GET'])
 @login_required
 def saved_tickers():
-    # Retrieve all records from the database
-    records = TickerData.query.all()
-    
+    # Only the per-exchange counts are rendered; the rows are paged in from /tickers
+    exchanges = (
+        db.session.query(TickerData.exchange, db.func.count(TickerData.id))
+        .filter_by(is_active=True)
+        .group_by(TickerData.exchange)
+        .order_by(TickerData.exchange)
+        .all()
+    )
+
     # Check if there are any records
-    if not records or len(records)==0:
+    if not exchanges:
         flash("No tickers found.", "info")  # Optional: Notify the user
-        asyncio.run(fetch_and_save_ticker_data())
-        print('records : \n',records)
-        return render_template('saved_tickers.html', grouped_records={})  # Pass an empty dictionary
-
-    # Group records by exchange
-    grouped_records = defaultdict(list)
-    for record in records:
-        grouped_records[record.exchange].append({
-            "id": record.id,
-            "symbol": record.symbol,
-            "name": record.name,
-          #   "updated_at": record.updated_at
-        })
-
-    return render_template('saved_tickers.html', grouped_records=grouped_records)
+        job = startTickerRefresh()
+        return render_template('saved_tickers.html', exchanges=[], job=job, page_size=TICKER_PAGE_SIZE)
+
+    return render_template('saved_tickers.html', exchanges=exchanges, page_size=TICKER_PAGE_SIZE)
+
+TICKER_PAGE_SIZE = 100
+TICKER_PAGE_MAX = 1000
+
+def encodeCursor(exchange, symbol):
+    return base64.urlsafe_b64encode(json.dumps([exchange, symbol]).encode()).decode()
+
+def decodeCursor(cursor):
+    try:
+        exchange, symbol = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        abort(400, description='Invalid cursor.')
+    return exchange, symbol
+
+@app.route('/tickers', methods=['GET'])
+@login_required
+def tickers():
+    """
+    One page of the listed catalog, ordered by (exchange, symbol).
+
+    Query parameters:
+        exchange (str): Only this exchange (optional).
+        limit (int): Page size, capped at TICKER_PAGE_MAX.
+        cursor (str): The `next` value of the previous page.
+
+    Returns:
+        JSON {'items': [{id, symbol, name, exchange}], 'next': cursor or null}.
+    """
+    exchange = request.args.get('exchange')
+    limit = max(1, min(request.args.get('limit', TICKER_PAGE_SIZE, type=int), TICKER_PAGE_MAX))
+    cursor = request.args.get('cursor')
+
+    query = db.session.query(
+        TickerData.id, TickerData.symbol, TickerData.name, TickerData.exchange
+    ).filter(TickerData.is_active.is_(True))
+    if exchange:
+        query = query.filter(TickerData.exchange == exchange)
+    if cursor:
+        # Keyset pagination: seek past the last row instead of OFFSET, so deep pages cost the same
+        query = query.filter(db.tuple_(TickerData.exchange, TickerData.symbol) > decodeCursor(cursor))
+    rows = query.order_by(TickerData.exchange, TickerData.symbol).limit(limit + 1).all()
+
+    page = rows[:limit]
+    return jsonify({
+        'items': [{'id': r.id, 'symbol': r.symbol, 'name': r.name, 'exchange': r.exchange} for r in page],
+        'next': encodeCursor(page[-1].exchange, page[-1].symbol) if len(rows) > limit else None,
+    })
+
+@app.route('/tickers/search', methods=['GET'])
+@login_required
+def search_tickers():
+    # Served from the in-memory prefix index; the database is only read to build it once
+    query = request.args.get('q', '')
+    limit = max(1, min(request.args.get('limit', 20, type=int), TICKER_PAGE_MAX))
+    symbol_index.ensure_loaded(lambda: db.session.query(
+        TickerData.symbol, TickerData.name, TickerData.exchange
+    ).filter(TickerData.is_active.is_(True)).all())
+    return jsonify(symbol_index.search(query, limit, request.args.get('exchange') or None))
 
 @app.route('/tickDataForm', methods=['POST'])
 @login_required
@@ -191,50 +404,279 @@ def tick_data_form():
     # Render a partial template for the form
     return render_template('tick_data_form.html', symbol=symbol, name=name)
 
+def requestCandles():
+    """
+    Candles for an analytics request. The body either references the candle
+    cache as {"handle": ..., "from": ..., "to": ...} (window optional, in chart
+    time units) or carries the full {"data": [...]} array.
+    """
+    payload = request.json
+    handle = payload.get('handle')
+    if handle:
+        data = candle_cache.get(handle, payload.get('from'), payload.get('to'))
+        if data is None:
+            abort(410, description='Candle handle expired, send the data instead.')
+        return data
+    return window(pd.DataFrame(payload.get('data')), payload.get('from'), payload.get('to'))
+
+MAX_PIVOT_INTERVALS = 16
+
+def pivotInterval(value):
+    # Lookbacks must be whole numbers >= 1; anything else is a client error
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        abort(400, description=f'Invalid pivot interval {value!r}.')
+    try:
+        interval = int(value)
+    except ValueError:
+        abort(400, description=f'Invalid pivot interval {value!r}.')
+    if interval < 1:
+        abort(400, description='Pivot intervals must be at least 1.')
+    return interval
+
+def requestIntervals():
+    """
+    Pivot lookback(s) for an analytics request: {"intervals": [2, 5, 10]} asks
+    for one result set per lookback, otherwise {"interval": n} (default 2).
+    Invalid values abort with 400.
+    """
+    payload = request.json
+    intervals = payload.get('intervals')
+    if intervals:
+        if not isinstance(intervals, list):
+            abort(400, description='"intervals" must be a list.')
+        if len(intervals) > MAX_PIVOT_INTERVALS:
+            abort(400, description=f'At most {MAX_PIVOT_INTERVALS} intervals per request.')
+        return [pivotInterval(i) for i in intervals], True
+    return [pivotInterval(payload.get('interval', 2))], False
+
+@app.route('/stream/<handle>', methods=['GET'])
+@login_required
+def stream(handle):
+    """
+    Server-Sent Events with live updates for a cached series: each event
+    carries the new/updated candles and only the overlays that changed
+    (swingHigh/swingLow, breakHigh/breakLow, gap).
+    """
+    pivot = pivotInterval(request.args.get('interval', 2))
+    events = stream_hub.subscribe(handle, pivot)
+    if events is None:
+        abort(410, description='Candle handle expired, reload the chart.')
+
+    def generate():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event = events.get(timeout=15)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if event is None:
+                    break
+                yield f'data: {app.json.dumps(event)}\n\n'
+        finally:
+            stream_hub.unsubscribe(handle, pivot, events)
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+CANDLE_COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume']
+
+def candlePayload(data):
+    """
+    Binary chart payload for a cached series: the CANDLE_COLUMNS one after
+    another as little-endian float64, n values each, so the browser reads them
+    with one Float64Array and no parsing. Time (epoch seconds) is sent as its
+    first value followed by the differences, which are nearly all the same
+    step and gzip to almost nothing.
+
+    Returns:
+        tuple: (raw bytes, gzip bytes, etag)
+    """
+    columns = [data[column].to_numpy(dtype=np.float64) for column in CANDLE_COLUMNS]
+    columns[0] = np.diff(columns[0], prepend=0.0)
+    raw = b''.join(np.ascontiguousarray(column, dtype='<f8').tobytes() for column in columns)
+    return raw, gzip.compress(raw, compresslevel=5), hashlib.sha1(raw).hexdigest()[:20]
+
+@app.route('/candles/<handle>', methods=['GET'])
+@login_required
+def candle_data(handle):
+    # Encoded once per series and kept with it in the cache; live extends drop it
+    payload = candle_cache.derived(handle, 'payload', candlePayload)
+    if payload is None:
+        abort(410, description='Candle handle expired, reload the chart.')
+    raw, packed, etag = payload
+
+    gzipped = 'gzip' in request.accept_encodings
+    response = Response(packed if gzipped else raw, mimetype='application/octet-stream')
+    if gzipped:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['X-Candle-Columns'] = ','.join(CANDLE_COLUMNS)
+    response.headers['Vary'] = 'Accept-Encoding'
+    # Revalidate every time: a live stream can extend the series behind the same handle
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.set_etag(f'{etag}-gz' if gzipped else etag)
+    return response.make_conditional(request)
+
 @app.route('/swings',methods=['POST'])
 @login_required
 def getSwing():
-    requestData = request.json.get('data')
-    data = pd.DataFrame(requestData)
-
-    swingData= getPivots(data)
-    df = pd.DataFrame(swingData['data'])
+    data = requestCandles()
+    intervals, multi = requestIntervals()
 
-    dfSwingHigh=df[df['isSwingHigh'].notna()][['index','startIndex','endIndex','isSwingHigh']]
-    dfSwingHigh.rename(columns={'index': 'time', 'isSwingHigh': 'value'}, inplace=True)
-
-    dfSwingLow=df[df['isSwingLow'].notna()][['index','startIndex','endIndex','isSwingLow']]
-    dfSwingLow.rename(columns={'index': 'time', 'isSwingLow': 'value'}, inplace=True)
-
-    resp={
-        'swingHigh':dfSwingHigh.to_dict(orient='records'),
-        'swingLow':dfSwingLow.to_dict(orient='records')
-    }
-    return jsonify(resp)
+    if multi:
+        return jsonify({str(k): v for k, v in getSwingsMulti(data, intervals).items()})
+    return jsonify(getSwings(data, intervals[0]))
 
 @app.route('/BOS',methods=['POST'])
 @login_required
 def getBOS():
-    requestData = request.json.get('data')
-    data = pd.DataFrame(requestData)
+    data = requestCandles()
+    intervals, multi = requestIntervals()
 
-    breaks=getSwingBreaks(data)
+    if multi:
+        breaks = getSwingBreaksMulti(data, intervals)
+        return jsonify({str(k): v["data"] for k, v in breaks.items()})
+
+    breaks=getSwingBreaks(data, intervals[0])
+    # Too few candles for the lookback leaves "data" empty
     resp={
-        "breakLow":breaks["data"]["breakLow"],
-        "breakHigh":breaks["data"]["breakHigh"]
+        "breakLow":breaks["data"].get("breakLow", []),
+        "breakHigh":breaks["data"].get("breakHigh", [])
     }
     return jsonify(resp)
 
 @app.route('/getGap',methods=['POST'])
 @login_required
 def getGap():
-    requestData = request.json.get('data')
-    data = pd.DataFrame(requestData)
+    data = requestCandles()
 
     breaks=getGaps(data)
     resp={
-        "gap":pd.DataFrame(breaks["data"]).to_dict(orient='records'),
+        "gap":breaks["data"],
+    }
+    return jsonify(resp)
+
+@app.route('/analyze',methods=['POST'])
+@login_required
+def getAnalysis():
+    data = requestCandles()
+    intervals, multi = requestIntervals()
+
+    if multi:
+        resp = analyzeMulti(data, intervals)
+        resp["intervals"] = {str(k): v for k, v in resp["intervals"].items()}
+        return jsonify(resp)
+    return jsonify(analyze(data, intervals[0]))
+
+MAX_INDICATOR_PERIODS = 32
+RSI_METHODS = ('wilder', 'ema', 'sma')
+
+def indicatorPeriod(value, name):
+    # Periods are JSON integers >= 1 (no strings, floats or booleans)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        abort(400, description=f'Invalid {name} period {value!r}, expected an integer >= 1.')
+    return value
+
+def requestIndicators():
+    """
+    Validated getIndicators spec from the request body's "indicators".
+    Invalid periods, methods or MACD triplets abort with 400.
+    """
+    spec = request.json.get('indicators', {})
+    if not isinstance(spec, dict):
+        abort(400, description='"indicators" must be an object.')
+    unknown = set(spec) - {'rsi', 'rsiMethod', 'ema', 'atr', 'bollinger', 'bollingerK', 'macd'}
+    if unknown:
+        abort(400, description=f'Unknown indicators: {", ".join(sorted(unknown))}.')
+
+    clean = {}
+    count = 0
+    for name in ('rsi', 'ema', 'atr', 'bollinger', 'macd'):
+        periods = spec.get(name)
+        if periods is None:
+            continue
+        if not isinstance(periods, list):
+            abort(400, description=f'"{name}" must be a list.')
+        count += len(periods)
+        if count > MAX_INDICATOR_PERIODS:
+            abort(400, description=f'At most {MAX_INDICATOR_PERIODS} indicator periods per request.')
+        if name == 'macd':
+            clean[name] = []
+            for triplet in periods:
+                if not isinstance(triplet, list) or len(triplet) != 3:
+                    abort(400, description=f'Invalid macd entry {triplet!r}, expected [fast, slow, signal].')
+                fast, slow, signal = (indicatorPeriod(v, 'macd') for v in triplet)
+                if fast >= slow:
+                    abort(400, description=f'Invalid macd entry {triplet!r}, fast must be below slow.')
+                clean[name].append([fast, slow, signal])
+        else:
+            clean[name] = [indicatorPeriod(p, name) for p in periods]
+
+    method = spec.get('rsiMethod', 'wilder')
+    if method not in RSI_METHODS:
+        abort(400, description=f'Unknown rsiMethod {method!r}, expected one of {", ".join(RSI_METHODS)}.')
+    clean['rsiMethod'] = method
+    k = spec.get('bollingerK', 2.0)
+    if isinstance(k, bool) or not isinstance(k, (int, float)) or not np.isfinite(k) or k <= 0:
+        abort(400, description=f'Invalid bollingerK {k!r}, expected a positive number.')
+    clean['bollingerK'] = float(k)
+    return clean
+
+@app.route('/indicators',methods=['POST'])
+@login_required
+def getIndicatorData():
+    data = requestCandles()
+    results = getIndicators(data, requestIndicators())
+
+    # Arrays are encoded as-is by the JSON provider (NaN warm-up values as null)
+    resp = {"time": data['time'].to_numpy()}
+    resp.update(results)
+    return jsonify(resp)
+
+VOLUME_BUCKETS = 50
+MAX_VOLUME_BUCKETS = 1000
+
+@app.route('/volume',methods=['POST'])
+@login_required
+def getVolume():
+    payload = request.json
+    buckets = payload.get('buckets', VOLUME_BUCKETS)
+    try:
+        if isinstance(buckets, (bool, float)):
+            raise ValueError(buckets)
+        buckets = int(buckets)
+    except (TypeError, ValueError):
+        abort(400, description=f'Invalid buckets {buckets!r}, expected an integer.')
+    if not 1 <= buckets <= MAX_VOLUME_BUCKETS:
+        abort(400, description=f'buckets must be between 1 and {MAX_VOLUME_BUCKETS}.')
+
+    handle = payload.get('handle')
+    if handle:
+        if buckets == VOLUME_BUCKETS:
+            # Only the default profile is kept with the series; other bucket counts
+            # are client-chosen and would let one client pile up cache entries
+            index = candle_cache.derived(handle, ('volume', buckets), lambda data: VolumeIndex(data, buckets))
+        else:
+            data = candle_cache.get(handle)
+            index = VolumeIndex(data, buckets) if data is not None else None
+        if index is None:
+            abort(410, description='Candle handle expired, send the data instead.')
+    else:
+        index = VolumeIndex(pd.DataFrame(payload.get('data')), buckets)
+
+    lo, hi = index.positions(payload.get('from'), payload.get('to'))
+    resp = {
+        "time": index.time[lo:hi],
+        "volume": index.volume(lo, hi),
+        "vwap": index.vwap(lo, hi),
+        "delta": index.delta(lo, hi),
     }
+    resp.update({
+        "vwapLine": index.vwapLine(lo, hi),
+        "cvd": index.cvd(lo, hi),
+        "profile": index.profile(lo, hi),
+    })
     return jsonify(resp)
 
 def formatedata(data):
@@ -247,20 +689,35 @@ def formatedata(data):
     # }).add_prefix('')
     # df = df.reset_index()
     df.columns = ['time', 'open', 'high', 'low', 'close', 'volume']
-    candlestick_data = df
-    # candlestick_data['time'] = pd.to_datetime(candlestick_data['time'])
-    volume_data = candlestick_data[['volume']]
-    # volume_data['time'] = pd.to_datetime(volume_data['time'])
-    df = df.drop(columns=['volume'])  # Removes only the 'volume' column
     # print(df.head())
     # df.index = pd.to_datetime(df['time'])
     # df = df.drop(columns=['time'])
     return df
 
+def chartCandles(data):
+    # Same shape the chart posts back: time as epoch seconds
+    df = data.copy()
+    df['time'] = (df['time'] - pd.Timestamp(0)) // pd.Timedelta(seconds=1)
+    return df
+
+def updateTickerRange(symbol, data):
+    # Span of the candles the chart loaded; nothing is written when it is already stored
+    if data.empty:
+        return
+    start_date = data['time'].iloc[0].to_pydatetime()
+    end_date = data['time'].iloc[-1].to_pydatetime()
+    ticker = TickerData.query.filter_by(exchange=STORE_EXCHANGE, symbol=symbol).first()
+    if ticker is None or (ticker.start_date, ticker.end_date) == (start_date, end_date):
+        return
+    ticker.start_date = start_date
+    ticker.end_date = end_date
+    db.session.commit()
+
 @app.route('/chart', methods=['GET'])
 @login_required
 def chart_view():
     symbol = request.args.get('symbol')
+    interval = request.args.get('interval', BASE_INTERVAL)
     requested_start = request.args.get('startDate')
     requested_end = request.args.get('endDate')
 
@@ -281,7 +738,13 @@ def chart_view():
     print('endDate',fetch_end)
     try:
         # Fetch historical data for the expanded range
-        data = fetch_binance_ohlc(symbol, fetch_start.strftime('%Y-%m-%d'), fetch_end.strftime('%Y-%m-%d'))
+        # Served from the local candle store; only missing ranges go to Binance
+        if interval != BASE_INTERVAL and can_resample(BASE_INTERVAL, interval):
+            loaded = candle_store.fetch(symbol, fetch_start, fetch_end, BASE_INTERVAL)
+            data = resample_ohlc(loaded, interval, BASE_INTERVAL).drop(columns='Complete')
+        else:
+            data = loaded = candle_store.fetch(symbol, fetch_start, fetch_end, interval)
+        updateTickerRange(symbol, loaded)
         
         if data.empty:
             flash(f"No data found for {symbol} in the given date range")
@@ -291,9 +754,13 @@ def chart_view():
         formatted_data = formatedata(data)
         
         print(formatted_data.head())
+        handle = candle_cache.put(symbol, interval, fetch_start, fetch_end, chartCandles(formatted_data))
+        # The candles themselves are fetched by the chart from /candles/<handle>
         return render_template('chart.html', 
-                            data=formatted_data.to_json(orient='records'), 
+                            handle=handle,
                             symbol=symbol,
+                            interval=interval,
+                            intervals=CHART_INTERVALS,
                             start_date=requested_start_date.strftime('%Y-%m-%d') if requested_start_date else '',
                             end_date=requested_end_date.strftime('%Y-%m-%d') if requested_end_date else '')
 
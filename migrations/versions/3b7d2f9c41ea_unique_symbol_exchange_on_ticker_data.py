@@ -0,0 +1,34 @@
+"""Unique (symbol, exchange) on TickerData and is_active flag
+
+Revision ID: 3b7d2f9c41ea
+Revises: 665a7e467d73
+Create Date: 2026-10-18 14:05:12.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7d2f9c41ea'
+down_revision = '665a7e467d73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Earlier refreshes inserted every symbol again; keep the oldest row of each
+    op.execute(
+        "DELETE FROM ticker_data WHERE id NOT IN "
+        "(SELECT MIN(id) FROM ticker_data GROUP BY symbol, exchange)"
+    )
+
+    with op.batch_alter_table('ticker_data', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()))
+        batch_op.create_unique_constraint('uq_ticker_data_symbol_exchange', ['symbol', 'exchange'])
+
+
+def downgrade():
+    with op.batch_alter_table('ticker_data', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_ticker_data_symbol_exchange', type_='unique')
+        batch_op.drop_column('is_active')
@@ -0,0 +1,28 @@
+"""Index (exchange, symbol) on TickerData
+
+Revision ID: 9f4c2a61d8b7
+Revises: 3b7d2f9c41ea
+Create Date: 2026-10-18 16:42:37.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f4c2a61d8b7'
+down_revision = '3b7d2f9c41ea'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Lookups by symbol already use the (symbol, exchange) unique constraint;
+    # this one serves the exchange filter and the keyset order of /tickers
+    with op.batch_alter_table('ticker_data', schema=None) as batch_op:
+        batch_op.create_index('ix_ticker_data_exchange_symbol', ['exchange', 'symbol'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('ticker_data', schema=None) as batch_op:
+        batch_op.drop_index('ix_ticker_data_exchange_symbol')
@@ -209,9 +209,20 @@ class CandlestickChart extends HTMLElement {
         this.trend = null;
         this.BOS = null;
         this.Gap = null;
+        // Gap records behind this.Gap, merged with live updates
+        this.gapData = [];
+        // One markers primitive per layer (e.g. swingHigh/swingLow), reused on every update
+        this.markerLayers = {};
         this.isPlot = null;
         this.crosshair = null
         this.data = [];
+        // Resolves once the candles from the src attribute are on the chart
+        this.loaded = Promise.resolve(this.data);
+        this.analysis = null;
+        this.handleExpired = false;
+        this.liveSource = null;
+        // Overlays the user has drawn; live updates extend only these
+        this.overlays = new Set();
     }
 
     connectedCallback() {
@@ -332,17 +343,9 @@ class CandlestickChart extends HTMLElement {
 
 
 
-            if (this.getAttribute('data')) {
-                this.data = JSON.parse(JSON.parse(this.getAttribute('data')));
-                this.data = this.data.map(item => {
-                    return {
-                        ...item,
-                        // time: new Date(item.time / 1000)
-                        time: item.time / 1000
-                    };
-                });
-
-                console.log(this.data)
+            if (this.getAttribute('src')) {
+                this.loaded = this.loadCandles(this.getAttribute('src'));
+            } else if (this.data.length) {
                 this.updateChart();
             }
             if (this.getAttribute('symbol')) {
@@ -407,23 +410,35 @@ class CandlestickChart extends HTMLElement {
         // canvas.addEventListener('mouseleave', () => this.handlePointerUp());
     }
 
-    postSwingData() {
-        return fetch('/swings', {  // Note the 'return' here
+    analyticsBody(options = {}) {
+        // Reference the candles the server already holds instead of re-uploading them
+        const handle = this.getAttribute('handle');
+        if (handle && !this.handleExpired) {
+            return { handle: handle, ...options };
+        }
+        return { data: this.data, ...options };
+    }
+
+    postAnalytics(url, options = {}) {
+        // Overlays are drawn on the candles, so wait until they are on the chart
+        return this.loaded.then(() => fetch(url, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ data: this.data })
-        })
+            body: JSON.stringify(this.analyticsBody(options))
+        }))
             .then(response => {
+                if (response.status === 410 && !this.handleExpired) {
+                    // Server evicted the cached series: fall back to posting the data
+                    this.handleExpired = true;
+                    return this.postAnalytics(url, options);
+                }
                 if (!response.ok) {
                     throw new Error('Network response was not ok');
                 }
                 return response.json();
             })
-            .then(result => {
-                return result;
-            })
             .catch(error => {
                 console.error('Error:', error);
                 alert('Error: ' + error.message);
@@ -431,52 +446,112 @@ class CandlestickChart extends HTMLElement {
             });
     }
 
+    postSwingData() {
+        return this.postAnalytics('/swings');
+    }
+
     postBOSData() {
-        return fetch('/BOS', {  // Note the 'return' here
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ data: this.data })
-        })
-            .then(response => {
-                if (!response.ok) {
-                    throw new Error('Network response was not ok');
-                }
-                return response.json();
-            })
-            .then(result => {
-                return result;
-            })
-            .catch(error => {
-                console.error('Error:', error);
-                alert('Error: ' + error.message);
-                throw error;
-            });
+        return this.postAnalytics('/BOS');
     }
 
     postGapData() {
-        return fetch('/getGap', {  // Note the 'return' here
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ data: this.data })
-        })
-            .then(response => {
-                if (!response.ok) {
-                    throw new Error('Network response was not ok');
-                }
-                return response.json();
-            })
-            .then(result => {
-                return result;
-            })
-            .catch(error => {
-                console.error('Error:', error);
-                alert('Error: ' + error.message);
+        return this.postAnalytics('/getGap');
+    }
+
+    postAnalyzeData(options = {}) {
+        // options: { interval: 5 } or { intervals: [2, 5, 10] } for one result set per lookback
+        return this.postAnalytics('/analyze', options);
+    }
+
+    postVolumeData(range = {}, buckets = 50) {
+        // VWAP, volume delta and volume profile for the visible range
+        return this.postAnalytics('/volume', { buckets: buckets, ...range });
+    }
+
+    postIndicatorData(indicators, range = {}) {
+        // e.g. { rsi: [14], ema: [20, 50], bollinger: [20], macd: [[12, 26, 9]] }
+        return this.postAnalytics('/indicators', { indicators: indicators, ...range });
+    }
+
+    analyze() {
+        // Swings, BOS and Gap share one /analyze round trip per data set
+        if (!this.analysis) {
+            const interval = this.getAttribute('pivot-interval');
+            const options = interval ? { interval: parseInt(interval) } : {};
+            this.analysis = this.postAnalyzeData(options).catch(error => {
+                this.analysis = null;
                 throw error;
             });
+        }
+        return this.analysis;
+    }
+
+    startLive() {
+        // Server-Sent Events: new candles plus only the overlays that changed.
+        // Live candles extend this.data, so the initial fetch has to land first.
+        return this.loaded.then(() => this.openLiveSource());
+    }
+
+    openLiveSource() {
+        const handle = this.getAttribute('handle');
+        if (!handle || this.handleExpired || this.liveSource) {
+            return;
+        }
+        const interval = this.getAttribute('pivot-interval');
+        const query = interval ? `?interval=${parseInt(interval)}` : '';
+        this.liveSource = new EventSource(`/stream/${handle}${query}`);
+        this.liveSource.onmessage = (message) => this.applyLiveUpdate(JSON.parse(message.data));
+        this.liveSource.onerror = () => {
+            if (this.liveSource && this.liveSource.readyState === EventSource.CLOSED) {
+                this.liveSource = null;
+            }
+        };
+    }
+
+    stopLive() {
+        if (this.liveSource) {
+            this.liveSource.close();
+            this.liveSource = null;
+        }
+    }
+
+    applyLiveUpdate(update) {
+        update.candles.forEach(candle => {
+            // update() replaces the last bar when the time matches, appends otherwise
+            this.series.update(candle);
+            const last = this.data[this.data.length - 1];
+            if (last && last.time === candle.time) {
+                this.data[this.data.length - 1] = candle;
+            } else {
+                this.data.push(candle);
+            }
+        });
+        if (update.swingHigh.length || update.swingLow.length || update.gap.length) {
+            // The cached /analyze result no longer covers the series
+            this.analysis = null;
+        }
+        if (this.overlays.has('swings')) {
+            if (update.swingHigh.length) {
+                this.plotCandlestickMarkers(update.swingHigh.map(swing => ({
+                    time: swing.time, direction: 'up', shape: 'arrowDown', id: `high-${swing.time}`, isBull: true
+                })), { layer: 'swingHigh', append: true });
+            }
+            if (update.swingLow.length) {
+                this.plotCandlestickMarkers(update.swingLow.map(swing => ({
+                    time: swing.time, direction: 'down', shape: 'arrowUp', id: `low-${swing.time}`, isBull: false
+                })), { layer: 'swingLow', append: true });
+            }
+        }
+        if (this.overlays.has('bos')) {
+            if (update.breakHigh.length) this.plotBOS(update.breakHigh, true);
+            if (update.breakLow.length) this.plotBOS(update.breakLow, false);
+        }
+        if (this.overlays.has('gap') && update.gap.length) {
+            // Open gaps are re-sent as their end moves; merge by start and redraw in place
+            const gaps = new Map(this.gapData.map(gap => [gap.index, gap]));
+            update.gap.forEach(gap => gaps.set(gap.index, gap));
+            this.plotGap([...gaps.values()].sort((a, b) => a.index - b.index));
+        }
     }
 
     plotCandlestickMarkers(
@@ -486,7 +561,9 @@ class CandlestickChart extends HTMLElement {
             defaultSize = 1,
             upColor = '#26a69a',
             downColor = '#ef5350',
-            autoPosition = true
+            autoPosition = true,
+            layer = 'default',
+            append = false
         } = {}) {
         if (!this.series || !markerData || !Array.isArray(markerData)) {
             console.error('Invalid inputs for plotCandlestickMarkers');
@@ -517,12 +594,35 @@ class CandlestickChart extends HTMLElement {
                 id: item.id
             };
         });
-        // console.log(this.series)
-        const seriesMarkers = LightweightCharts.createSeriesMarkers(this.series);
-        // and then you can modify the markers
-        // set it to empty array to remove all markers
+        // Each layer owns one markers primitive; later calls replace (or extend) its markers
+        let seriesMarkers = this.markerLayers[layer];
+        if (!seriesMarkers) {
+            seriesMarkers = LightweightCharts.createSeriesMarkers(this.series);
+            this.markerLayers[layer] = seriesMarkers;
+        }
+        if (append) {
+            markers.unshift(...seriesMarkers.markers());
+            markers.sort((a, b) => a.time - b.time);
+        }
         seriesMarkers.setMarkers(markers);
-        //   setMarkers(markers);
+    }
+
+    plotIndicatorLine(times, values, color = '#2962ff', paneIndex = 0) {
+        // Indicator values are null until their period has filled
+        const points = [];
+        times.forEach((time, i) => {
+            if (values[i] !== null) {
+                points.push({ time: time, value: values[i] });
+            }
+        });
+        const line = this.chart.addSeries(LightweightCharts.LineSeries, {
+            color: color,
+            lineWidth: 1,
+            priceLineVisible: false,
+            lastValueVisible: false,
+        }, paneIndex);
+        line.setData(points);
+        return line;
     }
 
     plotBOS(data,isBull=true) {
@@ -567,6 +667,11 @@ class CandlestickChart extends HTMLElement {
                 }
             }
         })
+        // Replace the gaps drawn before instead of stacking another layer
+        if (this.Gap) {
+            this.series.detachPrimitive(this.Gap);
+        }
+        this.gapData = data;
         this.Gap = new RectangleSeriesPrimitive(this.chart, this.series, Gaps);
         this.series.attachPrimitive(this.Gap);
         return
@@ -650,6 +755,7 @@ class CandlestickChart extends HTMLElement {
     }
 
     updateChart() {
+        this.analysis = null;
         if (this.series && this.data) {
             this.series.setData(this.data);
 
@@ -665,9 +771,49 @@ class CandlestickChart extends HTMLElement {
 
         }
     }
+    // Candles come from /candles/<handle> as float64 columns (see candlePayload in main.py)
+    loadCandles(src) {
+        return fetch(src)
+            .then(response => {
+                if (response.status === 410) {
+                    // Evicted before we got here: nothing server-side to stream or reference
+                    this.handleExpired = true;
+                    throw new Error('Candle handle expired, reload the chart.');
+                }
+                if (!response.ok) {
+                    throw new Error(`Failed to load candles: ${response.status}`);
+                }
+                const columns = (response.headers.get('X-Candle-Columns') || 'time,open,high,low,close,volume').split(',');
+                return response.arrayBuffer().then(buffer => [columns, new Float64Array(buffer)]);
+            })
+            .then(([columns, values]) => {
+                const n = values.length / columns.length;
+                const column = name => values.subarray(columns.indexOf(name) * n, (columns.indexOf(name) + 1) * n);
+                const time = column('time'), open = column('open'), high = column('high'),
+                    low = column('low'), close = column('close'), volume = column('volume');
+                const data = new Array(n);
+                // Time arrives delta-encoded: first value, then differences
+                let t = 0;
+                for (let i = 0; i < n; i++) {
+                    t += time[i];
+                    data[i] = { time: t, open: open[i], high: high[i], low: low[i], close: close[i], volume: volume[i] };
+                }
+                this.data = data;
+                this.updateChart();
+                return data;
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                alert('Error: ' + error.message);
+                return this.data;
+            });
+    }
+
     // Public method to update data
     updateData(newData) {
         this.data = newData;
+        // The server-side handle no longer describes these candles
+        this.handleExpired = true;
         this.setAttribute('data', JSON.stringify(newData));
     }
 